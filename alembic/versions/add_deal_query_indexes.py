@@ -0,0 +1,28 @@
+"""add deal query indexes
+
+Revision ID: add_deal_query_indexes
+Revises: add_message_timeline
+Create Date: 2024-02-12
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'add_deal_query_indexes'
+down_revision = 'add_message_timeline'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('parsed_deals', sa.Column('expiration_date', sa.DateTime(), nullable=True))
+
+    # Filters used by the local deal query engine
+    op.create_index('idx_parsed_deals_expiration_date', 'parsed_deals', ['expiration_date'])
+    op.create_index('idx_parsed_deals_pricing_cpa', 'parsed_deals', ['pricing_model', 'cpa_amount'])
+    op.create_index('idx_parsed_deals_pricing_cpl', 'parsed_deals', ['pricing_model', 'cpl_amount'])
+
+def downgrade():
+    op.drop_index('idx_parsed_deals_pricing_cpl')
+    op.drop_index('idx_parsed_deals_pricing_cpa')
+    op.drop_index('idx_parsed_deals_expiration_date')
+    op.drop_column('parsed_deals', 'expiration_date')
@@ -0,0 +1,20 @@
+"""add deal simhash
+
+Revision ID: add_deal_simhash
+Revises: partition_message_processing
+Create Date: 2024-03-04
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'add_deal_simhash'
+down_revision = 'partition_message_processing'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('parsed_deals', sa.Column('text_simhash', sa.BigInteger(), nullable=True))
+
+def downgrade():
+    op.drop_column('parsed_deals', 'text_simhash')
@@ -0,0 +1,22 @@
+"""add message sent_at
+
+Revision ID: add_message_sent_at
+Revises: add_notion_page_id
+Create Date: 2024-03-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'add_message_sent_at'
+down_revision = 'add_notion_page_id'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # When Telegram received the message; created_at stays the ingest time so
+    # backfilled history lands in current partitions and survives retention
+    op.add_column('message_processing', sa.Column('sent_at', sa.DateTime(), nullable=True))
+
+def downgrade():
+    op.drop_column('message_processing', 'sent_at')
@@ -0,0 +1,33 @@
+"""add message timeline
+
+Revision ID: add_message_timeline
+Revises: initial_migration
+Create Date: 2024-02-05
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = 'add_message_timeline'
+down_revision = 'initial_migration'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('message_processing', sa.Column('correlation_id', sa.String(length=32), nullable=True))
+    op.add_column('message_processing', sa.Column('timeline', postgresql.JSONB(), nullable=True))
+    op.add_column('message_processing', sa.Column('attempt_durations', sa.ARRAY(sa.Integer()), nullable=True))
+    op.add_column('message_processing', sa.Column('total_ms', sa.Integer(), nullable=True))
+
+    # Correlation lookups and slowest-N / percentile scans over a time window
+    op.create_index('ix_message_processing_correlation_id', 'message_processing', ['correlation_id'])
+    op.create_index('idx_message_processing_created_at_total_ms', 'message_processing', ['created_at', 'total_ms'])
+
+def downgrade():
+    op.drop_index('idx_message_processing_created_at_total_ms')
+    op.drop_index('ix_message_processing_correlation_id')
+    op.drop_column('message_processing', 'total_ms')
+    op.drop_column('message_processing', 'attempt_durations')
+    op.drop_column('message_processing', 'timeline')
+    op.drop_column('message_processing', 'correlation_id')
@@ -0,0 +1,29 @@
+"""add normalization aliases
+
+Revision ID: add_normalization_aliases
+Revises: add_deal_query_indexes
+Create Date: 2024-02-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'add_normalization_aliases'
+down_revision = 'add_deal_query_indexes'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'normalization_aliases',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('alias', sa.String(), nullable=False),
+        sa.Column('canonical', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('kind', 'alias', name='uq_normalization_aliases_kind_alias')
+    )
+
+def downgrade():
+    op.drop_table('normalization_aliases')
@@ -0,0 +1,44 @@
+"""add notion page id and active status
+
+Revision ID: add_notion_page_id
+Revises: add_deal_simhash
+Create Date: 2024-03-11
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'add_notion_page_id'
+down_revision = 'add_deal_simhash'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('parsed_deals', sa.Column('notion_page_id', sa.String(length=36), nullable=True))
+    op.add_column('parsed_deals', sa.Column('active_status', sa.String(length=20), nullable=True))
+
+    # Page URLs end in the 32-hex page id; store it in dashed UUID form
+    op.execute(r"""
+        UPDATE parsed_deals
+        SET notion_page_id = regexp_replace(
+            substring(notion_url from '([0-9a-f]{32})(?:[?#].*)?$'),
+            '^(.{8})(.{4})(.{4})(.{4})(.{12})$', '\1-\2-\3-\4-\5'
+        )
+        WHERE notion_url IS NOT NULL
+    """)
+    # Notion still shows every existing deal as Active; the sweeper reconciles expired ones
+    op.execute("UPDATE parsed_deals SET active_status = 'Active'")
+
+    op.create_index('idx_parsed_deals_notion_page_id', 'parsed_deals', ['notion_page_id'], unique=True)
+    op.create_index(
+        'idx_parsed_deals_active_expiration',
+        'parsed_deals',
+        ['expiration_date'],
+        postgresql_where=sa.text("active_status = 'Active'")
+    )
+
+def downgrade():
+    op.drop_index('idx_parsed_deals_active_expiration')
+    op.drop_index('idx_parsed_deals_notion_page_id')
+    op.drop_column('parsed_deals', 'active_status')
+    op.drop_column('parsed_deals', 'notion_page_id')
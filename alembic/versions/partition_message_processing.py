@@ -0,0 +1,134 @@
+"""partition message_processing and add lookup indexes
+
+Revision ID: partition_message_processing
+Revises: add_normalization_aliases
+Create Date: 2024-02-26
+
+"""
+from datetime import date
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'partition_message_processing'
+down_revision = 'add_normalization_aliases'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+COLUMNS = """
+    id INTEGER NOT NULL DEFAULT nextval('message_processing_id_seq'),
+    telegram_message_id VARCHAR,
+    raw_text TEXT,
+    status VARCHAR(20),
+    attempts INTEGER,
+    partner_name VARCHAR,
+    processed_at TIMESTAMP,
+    error_message TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT now(),
+    correlation_id VARCHAR(32),
+    timeline JSONB,
+    attempt_durations INTEGER[],
+    total_ms INTEGER
+"""
+
+COLUMN_NAMES = (
+    "id, telegram_message_id, raw_text, status, attempts, partner_name, processed_at, "
+    "error_message, created_at, correlation_id, timeline, attempt_durations, total_ms"
+)
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_indexes():
+    op.create_index('idx_message_processing_status', 'message_processing', ['status'])
+    op.create_index('idx_message_processing_telegram_message_id', 'message_processing', ['telegram_message_id'])
+    op.create_index('ix_message_processing_correlation_id', 'message_processing', ['correlation_id'])
+    op.create_index('idx_message_processing_created_at_total_ms', 'message_processing', ['created_at', 'total_ms'])
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    # parsed_deals lookups by message, and array containment/overlap filters
+    op.create_index('idx_parsed_deals_message_id', 'parsed_deals', ['message_id'])
+    op.create_index('idx_parsed_deals_sources', 'parsed_deals', ['sources'], postgresql_using='gin')
+    op.create_index('idx_parsed_deals_funnels', 'parsed_deals', ['funnels'], postgresql_using='gin')
+
+    # A foreign key to a partitioned table must include the partition key, and
+    # retention drops whole partitions, so parsed_deals keeps message_id as a
+    # plain indexed column from here on.
+    op.drop_constraint('parsed_deals_message_id_fkey', 'parsed_deals', type_='foreignkey')
+
+    # Swap message_processing for a table range-partitioned by month on created_at
+    op.execute("ALTER TABLE message_processing RENAME TO message_processing_old")
+    op.execute("ALTER INDEX message_processing_pkey RENAME TO message_processing_old_pkey")
+    op.execute("ALTER SEQUENCE message_processing_id_seq OWNED BY NONE")
+    for index in ('idx_message_processing_status', 'ix_message_processing_correlation_id',
+                  'idx_message_processing_created_at_total_ms'):
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+
+    op.execute(f"""
+        CREATE TABLE message_processing (
+            {COLUMNS},
+            CONSTRAINT message_processing_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("ALTER SEQUENCE message_processing_id_seq OWNED BY message_processing.id")
+    op.execute("CREATE TABLE message_processing_default PARTITION OF message_processing DEFAULT")
+
+    oldest = conn.execute(sa.text("SELECT min(created_at) FROM message_processing_old")).scalar()
+    today = date.today()
+    month = date((oldest or today).year, (oldest or today).month, 1)
+    last = _add_months(date(today.year, today.month, 1), MONTHS_AHEAD)
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE message_processing_y{month.year}m{month.month:02d} "
+            f"PARTITION OF message_processing FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+
+    op.execute(f"""
+        INSERT INTO message_processing ({COLUMN_NAMES})
+        SELECT {COLUMN_NAMES.replace('created_at', 'COALESCE(created_at, now())')}
+        FROM message_processing_old
+    """)
+    op.execute("DROP TABLE message_processing_old")
+    _create_indexes()
+
+
+def downgrade():
+    op.execute("ALTER TABLE message_processing RENAME TO message_processing_partitioned")
+    op.execute("ALTER INDEX message_processing_pkey RENAME TO message_processing_partitioned_pkey")
+    op.execute("ALTER SEQUENCE message_processing_id_seq OWNED BY NONE")
+    for index in ('idx_message_processing_status', 'idx_message_processing_telegram_message_id',
+                  'ix_message_processing_correlation_id', 'idx_message_processing_created_at_total_ms'):
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+
+    op.execute(f"""
+        CREATE TABLE message_processing (
+            {COLUMNS.replace('created_at TIMESTAMP NOT NULL', 'created_at TIMESTAMP')},
+            CONSTRAINT message_processing_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute("ALTER SEQUENCE message_processing_id_seq OWNED BY message_processing.id")
+    op.execute(f"""
+        INSERT INTO message_processing ({COLUMN_NAMES})
+        SELECT {COLUMN_NAMES} FROM message_processing_partitioned
+    """)
+    op.execute("DROP TABLE message_processing_partitioned CASCADE")
+
+    op.create_index('idx_message_processing_status', 'message_processing', ['status'])
+    op.create_index('ix_message_processing_correlation_id', 'message_processing', ['correlation_id'])
+    op.create_index('idx_message_processing_created_at_total_ms', 'message_processing', ['created_at', 'total_ms'])
+
+    # Deals whose messages were archived by retention cannot be re-linked
+    op.execute("UPDATE parsed_deals SET message_id = NULL WHERE message_id NOT IN (SELECT id FROM message_processing)")
+    op.create_foreign_key('parsed_deals_message_id_fkey', 'parsed_deals', 'message_processing', ['message_id'], ['id'])
+    op.drop_index('idx_parsed_deals_funnels')
+    op.drop_index('idx_parsed_deals_sources')
+    op.drop_index('idx_parsed_deals_message_id')
@@ -0,0 +1,27 @@
+from functools import lru_cache
+from app.services.queue_service import QueueService
+from app.services.telegram_service import TelegramService
+from app.services.timeline_service import TimelineService
+from app.services.normalization_service import NormalizationService
+
+# Services are built on first use (or during startup warm-up), not at import
+
+
+@lru_cache()
+def get_queue_service() -> QueueService:
+    return QueueService()
+
+
+@lru_cache()
+def get_timeline_service() -> TimelineService:
+    return TimelineService()
+
+
+@lru_cache()
+def get_normalization_service() -> NormalizationService:
+    return NormalizationService(redis_client=get_queue_service().redis)
+
+
+@lru_cache()
+def get_telegram_service() -> TelegramService:
+    return TelegramService()
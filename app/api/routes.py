@@ -1,17 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from app.db.base import get_db
+from app.core.logging import correlation_id_var
+from app.api.dependencies import get_normalization_service, get_queue_service, get_timeline_service
 from app.services.queue_service import QueueService
+from app.services.telegram_service import addressed_to_bot
+from app.services.timeline_service import TimelineService
+from app.services.normalization_service import KINDS, NormalizationService
 from app.models.message import MessageProcessing
 from datetime import datetime
+from typing import Optional
 import logging
+import uuid
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
-queue_service = QueueService()
 
 @router.post("/webhook/telegram")
-async def telegram_webhook(request: Request, db: Session = Depends(get_db)):
+async def telegram_webhook(
+    request: Request,
+    db: Session = Depends(get_db),
+    queue_service: QueueService = Depends(get_queue_service)
+):
     """Handle incoming Telegram messages"""
     try:
         data = await request.json()
@@ -20,15 +30,22 @@ async def telegram_webhook(request: Request, db: Session = Depends(get_db)):
         message = data.get("message", {})
         message_id = message.get("message_id")
         text = message.get("text", "")
+        chat_id = message.get("chat", {}).get("id")
+        user_id = message.get("from", {}).get("id", chat_id)
         
         if not message_id or not text:
             raise HTTPException(status_code=400, detail="Invalid message format")
             
         # Create database record
+        correlation_id = uuid.uuid4().hex
+        correlation_id_var.set(correlation_id)
         db_message = MessageProcessing(
             telegram_message_id=str(message_id),
             raw_text=text,
             status="pending",
+            correlation_id=correlation_id,
+            timeline={"received": 0},
+            sent_at=datetime.utcfromtimestamp(message["date"]) if message.get("date") else None,
             created_at=datetime.utcnow()
         )
         db.add(db_message)
@@ -38,17 +55,29 @@ async def telegram_webhook(request: Request, db: Session = Depends(get_db)):
         await queue_service.enqueue_message({
             "telegram_message_id": str(message_id),
             "text": text,
-            "db_id": db_message.id
+            "db_id": db_message.id,
+            "correlation_id": correlation_id,
+            "chat_id": chat_id,
+            "user_id": user_id,
+            "addressed": addressed_to_bot(message)
         })
+        logger.debug("Queued telegram message %s as %s", message_id, db_message.id)
         
-        return {"status": "success", "message": "Message queued for processing"}
+        return {
+            "status": "success",
+            "message": "Message queued for processing",
+            "correlation_id": correlation_id
+        }
         
     except Exception as e:
-        logger.error(f"Error processing webhook: {str(e)}")
+        logger.error("Error processing webhook: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/health")
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(
+    db: Session = Depends(get_db),
+    queue_service: QueueService = Depends(get_queue_service)
+):
     """Health check endpoint"""
     try:
         # Check database connection
@@ -63,5 +92,61 @@ async def health_check(db: Session = Depends(get_db)):
             "timestamp": datetime.utcnow().isoformat()
         }
     except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
+        logger.error("Health check failed: %s", e)
         raise HTTPException(status_code=500, detail="Service unhealthy")
+
+@router.get("/metrics/slowest")
+async def slowest_messages(
+    limit: int = Query(20, ge=1, le=500),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    timeline_service: TimelineService = Depends(get_timeline_service)
+):
+    """Slowest messages by end-to-end latency within a time window (default: last 24h)"""
+    try:
+        return {
+            "messages": timeline_service.get_slowest_messages(db, limit=limit, since=since, until=until)
+        }
+    except Exception as e:
+        logger.error("Failed to fetch slowest messages: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to fetch slowest messages")
+
+@router.get("/metrics/latency")
+async def latency_percentiles(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    timeline_service: TimelineService = Depends(get_timeline_service)
+):
+    """End-to-end and per-stage latency percentiles within a time window (default: last 24h)"""
+    try:
+        return timeline_service.get_latency_percentiles(db, since=since, until=until)
+    except Exception as e:
+        logger.error("Failed to compute latency percentiles: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to compute latency percentiles")
+
+@router.post("/normalization/aliases")
+async def add_normalization_alias(
+    request: Request,
+    db: Session = Depends(get_db),
+    normalization_service: NormalizationService = Depends(get_normalization_service)
+):
+    """Add or update a normalization alias; every process picks it up without a restart"""
+    data = await request.json()
+    kind, alias, canonical = data.get("kind"), data.get("alias"), data.get("canonical")
+    if kind not in KINDS or not alias or not canonical:
+        raise HTTPException(status_code=400, detail=f"kind must be one of {list(KINDS)}; alias and canonical are required")
+    try:
+        normalization_service.add_alias(db, kind, alias, canonical)
+        return {"status": "success", "kind": kind, "alias": alias, "canonical": canonical}
+    except Exception as e:
+        logger.error("Failed to add normalization alias: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to add normalization alias")
+
+@router.post("/normalization/reload")
+async def reload_normalization(normalization_service: NormalizationService = Depends(get_normalization_service)):
+    """Ask every process to rebuild its normalization tables from the database"""
+    if not normalization_service.publish_reload():
+        raise HTTPException(status_code=500, detail="Failed to publish normalization reload")
+    return {"status": "success"}
@@ -0,0 +1,36 @@
+import json
+import asyncio
+import logging
+import argparse
+from app.core.logging import setup_logging
+from app.db.base import SessionLocal
+from app.services.backfill_service import BackfillImporter
+
+logger = logging.getLogger(__name__)
+
+
+async def main(args):
+    importer = BackfillImporter(batch_size=args.batch_size)
+    db = SessionLocal()
+    try:
+        return await importer.run(
+            db,
+            args.export,
+            args.checkpoint or f"{args.export}.checkpoint.json",
+            partner_name=args.partner
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a Telegram chat export (result.json) into the deal queue")
+    parser.add_argument("export", help="Path to the Telegram Desktop JSON export")
+    parser.add_argument("--partner", help="Partner name to record on every imported message")
+    parser.add_argument("--batch-size", type=int, help="Messages per insert/enqueue batch")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <export>.checkpoint.json)")
+    args = parser.parse_args()
+
+    setup_logging()
+    summary = asyncio.run(main(args))
+    print(json.dumps(summary, indent=2))
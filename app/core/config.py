@@ -1,6 +1,6 @@
 import os
 from pydantic import BaseSettings
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 class Settings(BaseSettings):
     # API Keys
@@ -8,16 +8,62 @@ class Settings(BaseSettings):
     ANTHROPIC_API_KEY: str
     NOTION_API_KEY: str
     NOTION_DATABASE_ID: str
+
+    # API base URLs (override to point at local stand-ins, e.g. benchmarks)
+    ANTHROPIC_BASE_URL: Optional[str] = None
+    NOTION_BASE_URL: Optional[str] = None
+    TELEGRAM_API_URL: str = "https://api.telegram.org"
+    TELEGRAM_BOT_USERNAME: Optional[str] = None  # without "@"; group messages mentioning it get a reply
     
     # Database
     DATABASE_URL: str
     
     # Redis
     REDIS_URL: str
+
+    # Conversation context
+    CONTEXT_BACKEND: str = "redis"  # 'redis' (shared) or 'memory' (per-process)
+    CONTEXT_MAX_USERS: int = 10000  # memory backend only
+    CONTEXT_MAX_MESSAGES: int = 20
+    CONTEXT_TTL_SECONDS: int = 86400
+    CONTEXT_TOKEN_BUDGET: int = 2000
+
+    # Streaming replies
+    STREAM_REPLIES: bool = True
+    STREAM_EDIT_INTERVAL: float = 1.0  # seconds between edits of one chat message
+
+    # Deal query cache
+    DEAL_QUERY_CACHE_TTL: float = 60.0  # seconds; bounds staleness as deals expire by date
+
+    # Normalization tables
+    NORMALIZATION_RELOAD_INTERVAL: float = 30.0  # seconds between generation checks
+
+    # Near-duplicate detection
+    DEDUP_MAX_DISTANCE: int = 3  # max SimHash Hamming distance (must stay below 4 bands)
+    DEDUP_WINDOW_DAYS: int = 30
+
+    # Expiration sweeper
+    EXPIRATION_SWEEP_INTERVAL: int = 300  # seconds between sweeps
+    EXPIRATION_BATCH_SIZE: int = 50
+
+    # Backfill importer
+    BACKFILL_BATCH_SIZE: int = 500
+    BACKFILL_MAX_BACKLOG: int = 5000  # pause importing while this many backfill messages wait
+
+    # Retention for message_processing partitions
+    MESSAGE_RETENTION_MONTHS: int = 6
+    PARTITION_MONTHS_AHEAD: int = 3
+    ARCHIVE_DIR: str = "archive"
+    RETENTION_INTERVAL: int = 86400  # seconds between scheduled retention passes
+
+    # Startup warm-up
+    STARTUP_DB_CONNECTIONS: int = 2  # pooled connections opened before serving
     
     # Application
     ENVIRONMENT: str
     LOG_LEVEL: str
+    LOG_FORMAT: str = "json"  # console output: 'json' or 'text'
+    LOG_DEBUG_SAMPLE_EVERY: int = 100  # keep one in N DEBUG records per call site
     MAX_RETRIES: int
     WEBHOOK_SECRET: str
 
@@ -52,10 +98,11 @@ SOURCE_MAPPING = {
 
 LOGGING_CONFIG = {
     'version': 1,
+    'disable_existing_loggers': False,
     'handlers': {
         'console': {
             'class': 'logging.StreamHandler',
-            'formatter': 'standard',
+            'formatter': 'json' if settings.LOG_FORMAT == 'json' else 'standard',
             'level': 'INFO'
         },
         'file': {
@@ -63,7 +110,7 @@ LOGGING_CONFIG = {
             'filename': 'deals.log',
             'maxBytes': 5242880,  # 5MB
             'backupCount': 3,
-            'formatter': 'detailed',
+            'formatter': 'json',
             'level': 'DEBUG'
         }
     },
@@ -73,6 +120,14 @@ LOGGING_CONFIG = {
         },
         'detailed': {
             'format': '%(asctime)s [%(levelname)s] %(name)s:%(lineno)d %(message)s'
+        },
+        'json': {
+            '()': 'app.core.logging.JsonFormatter'
         }
+    },
+    # Handlers are moved behind a background queue by setup_logging()
+    'root': {
+        'level': settings.LOG_LEVEL.upper(),
+        'handlers': ['console', 'file']
     }
 }
@@ -0,0 +1,442 @@
+"""ISO-3166-1 country and ISO-639-1 language reference tables used for normalization"""
+
+# alpha-2, alpha-3, English name
+COUNTRIES = [
+    ("AD", "AND", "Andorra"),
+    ("AE", "ARE", "United Arab Emirates"),
+    ("AF", "AFG", "Afghanistan"),
+    ("AG", "ATG", "Antigua and Barbuda"),
+    ("AI", "AIA", "Anguilla"),
+    ("AL", "ALB", "Albania"),
+    ("AM", "ARM", "Armenia"),
+    ("AO", "AGO", "Angola"),
+    ("AQ", "ATA", "Antarctica"),
+    ("AR", "ARG", "Argentina"),
+    ("AS", "ASM", "American Samoa"),
+    ("AT", "AUT", "Austria"),
+    ("AU", "AUS", "Australia"),
+    ("AW", "ABW", "Aruba"),
+    ("AX", "ALA", "Åland Islands"),
+    ("AZ", "AZE", "Azerbaijan"),
+    ("BA", "BIH", "Bosnia and Herzegovina"),
+    ("BB", "BRB", "Barbados"),
+    ("BD", "BGD", "Bangladesh"),
+    ("BE", "BEL", "Belgium"),
+    ("BF", "BFA", "Burkina Faso"),
+    ("BG", "BGR", "Bulgaria"),
+    ("BH", "BHR", "Bahrain"),
+    ("BI", "BDI", "Burundi"),
+    ("BJ", "BEN", "Benin"),
+    ("BL", "BLM", "Saint Barthélemy"),
+    ("BM", "BMU", "Bermuda"),
+    ("BN", "BRN", "Brunei Darussalam"),
+    ("BO", "BOL", "Bolivia"),
+    ("BQ", "BES", "Bonaire, Sint Eustatius and Saba"),
+    ("BR", "BRA", "Brazil"),
+    ("BS", "BHS", "Bahamas"),
+    ("BT", "BTN", "Bhutan"),
+    ("BV", "BVT", "Bouvet Island"),
+    ("BW", "BWA", "Botswana"),
+    ("BY", "BLR", "Belarus"),
+    ("BZ", "BLZ", "Belize"),
+    ("CA", "CAN", "Canada"),
+    ("CC", "CCK", "Cocos (Keeling) Islands"),
+    ("CD", "COD", "Congo, The Democratic Republic of the"),
+    ("CF", "CAF", "Central African Republic"),
+    ("CG", "COG", "Congo"),
+    ("CH", "CHE", "Switzerland"),
+    ("CI", "CIV", "Côte d'Ivoire"),
+    ("CK", "COK", "Cook Islands"),
+    ("CL", "CHL", "Chile"),
+    ("CM", "CMR", "Cameroon"),
+    ("CN", "CHN", "China"),
+    ("CO", "COL", "Colombia"),
+    ("CR", "CRI", "Costa Rica"),
+    ("CU", "CUB", "Cuba"),
+    ("CV", "CPV", "Cabo Verde"),
+    ("CW", "CUW", "Curaçao"),
+    ("CX", "CXR", "Christmas Island"),
+    ("CY", "CYP", "Cyprus"),
+    ("CZ", "CZE", "Czechia"),
+    ("DE", "DEU", "Germany"),
+    ("DJ", "DJI", "Djibouti"),
+    ("DK", "DNK", "Denmark"),
+    ("DM", "DMA", "Dominica"),
+    ("DO", "DOM", "Dominican Republic"),
+    ("DZ", "DZA", "Algeria"),
+    ("EC", "ECU", "Ecuador"),
+    ("EE", "EST", "Estonia"),
+    ("EG", "EGY", "Egypt"),
+    ("EH", "ESH", "Western Sahara"),
+    ("ER", "ERI", "Eritrea"),
+    ("ES", "ESP", "Spain"),
+    ("ET", "ETH", "Ethiopia"),
+    ("FI", "FIN", "Finland"),
+    ("FJ", "FJI", "Fiji"),
+    ("FK", "FLK", "Falkland Islands (Malvinas)"),
+    ("FM", "FSM", "Micronesia, Federated States of"),
+    ("FO", "FRO", "Faroe Islands"),
+    ("FR", "FRA", "France"),
+    ("GA", "GAB", "Gabon"),
+    ("GB", "GBR", "United Kingdom"),
+    ("GD", "GRD", "Grenada"),
+    ("GE", "GEO", "Georgia"),
+    ("GF", "GUF", "French Guiana"),
+    ("GG", "GGY", "Guernsey"),
+    ("GH", "GHA", "Ghana"),
+    ("GI", "GIB", "Gibraltar"),
+    ("GL", "GRL", "Greenland"),
+    ("GM", "GMB", "Gambia"),
+    ("GN", "GIN", "Guinea"),
+    ("GP", "GLP", "Guadeloupe"),
+    ("GQ", "GNQ", "Equatorial Guinea"),
+    ("GR", "GRC", "Greece"),
+    ("GS", "SGS", "South Georgia and the South Sandwich Islands"),
+    ("GT", "GTM", "Guatemala"),
+    ("GU", "GUM", "Guam"),
+    ("GW", "GNB", "Guinea-Bissau"),
+    ("GY", "GUY", "Guyana"),
+    ("HK", "HKG", "Hong Kong"),
+    ("HM", "HMD", "Heard Island and McDonald Islands"),
+    ("HN", "HND", "Honduras"),
+    ("HR", "HRV", "Croatia"),
+    ("HT", "HTI", "Haiti"),
+    ("HU", "HUN", "Hungary"),
+    ("ID", "IDN", "Indonesia"),
+    ("IE", "IRL", "Ireland"),
+    ("IL", "ISR", "Israel"),
+    ("IM", "IMN", "Isle of Man"),
+    ("IN", "IND", "India"),
+    ("IO", "IOT", "British Indian Ocean Territory"),
+    ("IQ", "IRQ", "Iraq"),
+    ("IR", "IRN", "Iran"),
+    ("IS", "ISL", "Iceland"),
+    ("IT", "ITA", "Italy"),
+    ("JE", "JEY", "Jersey"),
+    ("JM", "JAM", "Jamaica"),
+    ("JO", "JOR", "Jordan"),
+    ("JP", "JPN", "Japan"),
+    ("KE", "KEN", "Kenya"),
+    ("KG", "KGZ", "Kyrgyzstan"),
+    ("KH", "KHM", "Cambodia"),
+    ("KI", "KIR", "Kiribati"),
+    ("KM", "COM", "Comoros"),
+    ("KN", "KNA", "Saint Kitts and Nevis"),
+    ("KP", "PRK", "North Korea"),
+    ("KR", "KOR", "South Korea"),
+    ("KW", "KWT", "Kuwait"),
+    ("KY", "CYM", "Cayman Islands"),
+    ("KZ", "KAZ", "Kazakhstan"),
+    ("LA", "LAO", "Laos"),
+    ("LB", "LBN", "Lebanon"),
+    ("LC", "LCA", "Saint Lucia"),
+    ("LI", "LIE", "Liechtenstein"),
+    ("LK", "LKA", "Sri Lanka"),
+    ("LR", "LBR", "Liberia"),
+    ("LS", "LSO", "Lesotho"),
+    ("LT", "LTU", "Lithuania"),
+    ("LU", "LUX", "Luxembourg"),
+    ("LV", "LVA", "Latvia"),
+    ("LY", "LBY", "Libya"),
+    ("MA", "MAR", "Morocco"),
+    ("MC", "MCO", "Monaco"),
+    ("MD", "MDA", "Moldova"),
+    ("ME", "MNE", "Montenegro"),
+    ("MF", "MAF", "Saint Martin (French part)"),
+    ("MG", "MDG", "Madagascar"),
+    ("MH", "MHL", "Marshall Islands"),
+    ("MK", "MKD", "North Macedonia"),
+    ("ML", "MLI", "Mali"),
+    ("MM", "MMR", "Myanmar"),
+    ("MN", "MNG", "Mongolia"),
+    ("MO", "MAC", "Macao"),
+    ("MP", "MNP", "Northern Mariana Islands"),
+    ("MQ", "MTQ", "Martinique"),
+    ("MR", "MRT", "Mauritania"),
+    ("MS", "MSR", "Montserrat"),
+    ("MT", "MLT", "Malta"),
+    ("MU", "MUS", "Mauritius"),
+    ("MV", "MDV", "Maldives"),
+    ("MW", "MWI", "Malawi"),
+    ("MX", "MEX", "Mexico"),
+    ("MY", "MYS", "Malaysia"),
+    ("MZ", "MOZ", "Mozambique"),
+    ("NA", "NAM", "Namibia"),
+    ("NC", "NCL", "New Caledonia"),
+    ("NE", "NER", "Niger"),
+    ("NF", "NFK", "Norfolk Island"),
+    ("NG", "NGA", "Nigeria"),
+    ("NI", "NIC", "Nicaragua"),
+    ("NL", "NLD", "Netherlands"),
+    ("NO", "NOR", "Norway"),
+    ("NP", "NPL", "Nepal"),
+    ("NR", "NRU", "Nauru"),
+    ("NU", "NIU", "Niue"),
+    ("NZ", "NZL", "New Zealand"),
+    ("OM", "OMN", "Oman"),
+    ("PA", "PAN", "Panama"),
+    ("PE", "PER", "Peru"),
+    ("PF", "PYF", "French Polynesia"),
+    ("PG", "PNG", "Papua New Guinea"),
+    ("PH", "PHL", "Philippines"),
+    ("PK", "PAK", "Pakistan"),
+    ("PL", "POL", "Poland"),
+    ("PM", "SPM", "Saint Pierre and Miquelon"),
+    ("PN", "PCN", "Pitcairn"),
+    ("PR", "PRI", "Puerto Rico"),
+    ("PS", "PSE", "Palestine, State of"),
+    ("PT", "PRT", "Portugal"),
+    ("PW", "PLW", "Palau"),
+    ("PY", "PRY", "Paraguay"),
+    ("QA", "QAT", "Qatar"),
+    ("RE", "REU", "Réunion"),
+    ("RO", "ROU", "Romania"),
+    ("RS", "SRB", "Serbia"),
+    ("RU", "RUS", "Russian Federation"),
+    ("RW", "RWA", "Rwanda"),
+    ("SA", "SAU", "Saudi Arabia"),
+    ("SB", "SLB", "Solomon Islands"),
+    ("SC", "SYC", "Seychelles"),
+    ("SD", "SDN", "Sudan"),
+    ("SE", "SWE", "Sweden"),
+    ("SG", "SGP", "Singapore"),
+    ("SH", "SHN", "Saint Helena, Ascension and Tristan da Cunha"),
+    ("SI", "SVN", "Slovenia"),
+    ("SJ", "SJM", "Svalbard and Jan Mayen"),
+    ("SK", "SVK", "Slovakia"),
+    ("SL", "SLE", "Sierra Leone"),
+    ("SM", "SMR", "San Marino"),
+    ("SN", "SEN", "Senegal"),
+    ("SO", "SOM", "Somalia"),
+    ("SR", "SUR", "Suriname"),
+    ("SS", "SSD", "South Sudan"),
+    ("ST", "STP", "Sao Tome and Principe"),
+    ("SV", "SLV", "El Salvador"),
+    ("SX", "SXM", "Sint Maarten (Dutch part)"),
+    ("SY", "SYR", "Syria"),
+    ("SZ", "SWZ", "Eswatini"),
+    ("TC", "TCA", "Turks and Caicos Islands"),
+    ("TD", "TCD", "Chad"),
+    ("TF", "ATF", "French Southern Territories"),
+    ("TG", "TGO", "Togo"),
+    ("TH", "THA", "Thailand"),
+    ("TJ", "TJK", "Tajikistan"),
+    ("TK", "TKL", "Tokelau"),
+    ("TL", "TLS", "Timor-Leste"),
+    ("TM", "TKM", "Turkmenistan"),
+    ("TN", "TUN", "Tunisia"),
+    ("TO", "TON", "Tonga"),
+    ("TR", "TUR", "Türkiye"),
+    ("TT", "TTO", "Trinidad and Tobago"),
+    ("TV", "TUV", "Tuvalu"),
+    ("TW", "TWN", "Taiwan"),
+    ("TZ", "TZA", "Tanzania"),
+    ("UA", "UKR", "Ukraine"),
+    ("UG", "UGA", "Uganda"),
+    ("UM", "UMI", "United States Minor Outlying Islands"),
+    ("US", "USA", "United States"),
+    ("UY", "URY", "Uruguay"),
+    ("UZ", "UZB", "Uzbekistan"),
+    ("VA", "VAT", "Holy See (Vatican City State)"),
+    ("VC", "VCT", "Saint Vincent and the Grenadines"),
+    ("VE", "VEN", "Venezuela"),
+    ("VG", "VGB", "Virgin Islands, British"),
+    ("VI", "VIR", "Virgin Islands, U.S."),
+    ("VN", "VNM", "Vietnam"),
+    ("VU", "VUT", "Vanuatu"),
+    ("WF", "WLF", "Wallis and Futuna"),
+    ("WS", "WSM", "Samoa"),
+    ("YE", "YEM", "Yemen"),
+    ("YT", "MYT", "Mayotte"),
+    ("ZA", "ZAF", "South Africa"),
+    ("ZM", "ZMB", "Zambia"),
+    ("ZW", "ZWE", "Zimbabwe"),
+]
+
+# ISO-639-1 code, English name
+LANGUAGES = [
+    ("AA", "Afar"),
+    ("AB", "Abkhazian"),
+    ("AE", "Avestan"),
+    ("AF", "Afrikaans"),
+    ("AK", "Akan"),
+    ("AM", "Amharic"),
+    ("AN", "Aragonese"),
+    ("AR", "Arabic"),
+    ("AS", "Assamese"),
+    ("AV", "Avaric"),
+    ("AY", "Aymara"),
+    ("AZ", "Azerbaijani"),
+    ("BA", "Bashkir"),
+    ("BE", "Belarusian"),
+    ("BG", "Bulgarian"),
+    ("BH", "Bihari languages"),
+    ("BI", "Bislama"),
+    ("BM", "Bambara"),
+    ("BN", "Bengali"),
+    ("BO", "Tibetan"),
+    ("BR", "Breton"),
+    ("BS", "Bosnian"),
+    ("CA", "Catalan"),
+    ("CE", "Chechen"),
+    ("CH", "Chamorro"),
+    ("CO", "Corsican"),
+    ("CR", "Cree"),
+    ("CS", "Czech"),
+    ("CU", "Church Slavic"),
+    ("CV", "Chuvash"),
+    ("CY", "Welsh"),
+    ("DA", "Danish"),
+    ("DE", "German"),
+    ("DV", "Divehi"),
+    ("DZ", "Dzongkha"),
+    ("EE", "Ewe"),
+    ("EL", "Greek, Modern (1453-)"),
+    ("EN", "English"),
+    ("EO", "Esperanto"),
+    ("ES", "Spanish"),
+    ("ET", "Estonian"),
+    ("EU", "Basque"),
+    ("FA", "Persian"),
+    ("FF", "Fulah"),
+    ("FI", "Finnish"),
+    ("FJ", "Fijian"),
+    ("FO", "Faroese"),
+    ("FR", "French"),
+    ("FY", "Western Frisian"),
+    ("GA", "Irish"),
+    ("GD", "Gaelic"),
+    ("GL", "Galician"),
+    ("GN", "Guarani"),
+    ("GU", "Gujarati"),
+    ("GV", "Manx"),
+    ("HA", "Hausa"),
+    ("HE", "Hebrew"),
+    ("HI", "Hindi"),
+    ("HO", "Hiri Motu"),
+    ("HR", "Croatian"),
+    ("HT", "Haitian"),
+    ("HU", "Hungarian"),
+    ("HY", "Armenian"),
+    ("HZ", "Herero"),
+    ("IA", "Interlingua (International Auxiliary Language Association)"),
+    ("ID", "Indonesian"),
+    ("IE", "Interlingue"),
+    ("IG", "Igbo"),
+    ("II", "Sichuan Yi"),
+    ("IK", "Inupiaq"),
+    ("IO", "Ido"),
+    ("IS", "Icelandic"),
+    ("IT", "Italian"),
+    ("IU", "Inuktitut"),
+    ("JA", "Japanese"),
+    ("JV", "Javanese"),
+    ("KA", "Georgian"),
+    ("KG", "Kongo"),
+    ("KI", "Kikuyu"),
+    ("KJ", "Kuanyama"),
+    ("KK", "Kazakh"),
+    ("KL", "Kalaallisut"),
+    ("KM", "Central Khmer"),
+    ("KN", "Kannada"),
+    ("KO", "Korean"),
+    ("KR", "Kanuri"),
+    ("KS", "Kashmiri"),
+    ("KU", "Kurdish"),
+    ("KV", "Komi"),
+    ("KW", "Cornish"),
+    ("KY", "Kirghiz"),
+    ("LA", "Latin"),
+    ("LB", "Luxembourgish"),
+    ("LG", "Ganda"),
+    ("LI", "Limburgan"),
+    ("LN", "Lingala"),
+    ("LO", "Lao"),
+    ("LT", "Lithuanian"),
+    ("LU", "Luba-Katanga"),
+    ("LV", "Latvian"),
+    ("MG", "Malagasy"),
+    ("MH", "Marshallese"),
+    ("MI", "Maori"),
+    ("MK", "Macedonian"),
+    ("ML", "Malayalam"),
+    ("MN", "Mongolian"),
+    ("MR", "Marathi"),
+    ("MS", "Malay"),
+    ("MT", "Maltese"),
+    ("MY", "Burmese"),
+    ("NA", "Nauru"),
+    ("NB", "Bokmål, Norwegian"),
+    ("ND", "Ndebele, North"),
+    ("NE", "Nepali"),
+    ("NG", "Ndonga"),
+    ("NL", "Dutch"),
+    ("NN", "Norwegian Nynorsk"),
+    ("NO", "Norwegian"),
+    ("NR", "Ndebele, South"),
+    ("NV", "Navajo"),
+    ("NY", "Chichewa"),
+    ("OC", "Occitan (post 1500)"),
+    ("OJ", "Ojibwa"),
+    ("OM", "Oromo"),
+    ("OR", "Oriya"),
+    ("OS", "Ossetian"),
+    ("PA", "Panjabi"),
+    ("PI", "Pali"),
+    ("PL", "Polish"),
+    ("PS", "Pushto"),
+    ("PT", "Portuguese"),
+    ("QU", "Quechua"),
+    ("RM", "Romansh"),
+    ("RN", "Rundi"),
+    ("RO", "Romanian"),
+    ("RU", "Russian"),
+    ("RW", "Kinyarwanda"),
+    ("SA", "Sanskrit"),
+    ("SC", "Sardinian"),
+    ("SD", "Sindhi"),
+    ("SE", "Northern Sami"),
+    ("SG", "Sango"),
+    ("SI", "Sinhala"),
+    ("SK", "Slovak"),
+    ("SL", "Slovenian"),
+    ("SM", "Samoan"),
+    ("SN", "Shona"),
+    ("SO", "Somali"),
+    ("SQ", "Albanian"),
+    ("SR", "Serbian"),
+    ("SS", "Swati"),
+    ("ST", "Sotho, Southern"),
+    ("SU", "Sundanese"),
+    ("SV", "Swedish"),
+    ("SW", "Swahili"),
+    ("TA", "Tamil"),
+    ("TE", "Telugu"),
+    ("TG", "Tajik"),
+    ("TH", "Thai"),
+    ("TI", "Tigrinya"),
+    ("TK", "Turkmen"),
+    ("TL", "Tagalog"),
+    ("TN", "Tswana"),
+    ("TO", "Tonga (Tonga Islands)"),
+    ("TR", "Turkish"),
+    ("TS", "Tsonga"),
+    ("TT", "Tatar"),
+    ("TW", "Twi"),
+    ("TY", "Tahitian"),
+    ("UG", "Uighur"),
+    ("UK", "Ukrainian"),
+    ("UR", "Urdu"),
+    ("UZ", "Uzbek"),
+    ("VE", "Venda"),
+    ("VI", "Vietnamese"),
+    ("VO", "Volapük"),
+    ("WA", "Walloon"),
+    ("WO", "Wolof"),
+    ("XH", "Xhosa"),
+    ("YI", "Yiddish"),
+    ("YO", "Yoruba"),
+    ("ZA", "Zhuang"),
+    ("ZH", "Chinese"),
+    ("ZU", "Zulu"),
+]
@@ -1,18 +1,115 @@
+import copy
+import json
+import queue
+import atexit
 import logging
-from app.core.config import LOGGING_CONFIG
+import logging.config
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+from app.core.config import settings, LOGGING_CONFIG
+
+# Correlation id of the message being handled; set by the webhook and the worker
+correlation_id_var: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+
+_listener: Optional[QueueListener] = None
+
+
+class CorrelationIdFilter(logging.Filter):
+    """Stamp records with the current correlation id"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.correlation_id = correlation_id_var.get()
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """Pass every record above DEBUG, and one in `every` DEBUG records per call site"""
+
+    def __init__(self, every: int = 1):
+        super().__init__()
+        self.every = max(1, every)
+        self.counts = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.every == 1:
+            return True
+        key = (record.pathname, record.lineno)
+        count = self.counts.get(key, 0)
+        self.counts[key] = count + 1
+        return count % self.every == 0
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "correlation_id": getattr(record, "correlation_id", None),
+            "location": f"{record.module}:{record.lineno}"
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class LogQueueHandler(QueueHandler):
+    """Hands records to the background listener with only the message merged.
+
+    The stock handler runs the full formatter on the calling thread; here the
+    caller only pays for `getMessage()` on records that passed the filters.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            # Tracebacks hold frames, so they are rendered before leaving the thread
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def stop_logging():
+    """Flush queued records and stop the background writer"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 
 def setup_logging():
-    """Configure logging for the application"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s [%(levelname)s] %(message)s',
-        handlers=[
-            logging.StreamHandler()
-        ]
-    )
-
-    # Apply any custom logging configuration
-    if LOGGING_CONFIG:
-        logging.config.dictConfig(LOGGING_CONFIG)
+    """Configure logging for the application.
+
+    Handlers from LOGGING_CONFIG are moved behind a queue drained by a
+    background thread, so console and file I/O never run on the event loop.
+    """
+    global _listener
+    stop_logging()
+    logging.config.dictConfig(LOGGING_CONFIG)
+
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    log_queue = queue.SimpleQueue()
+    queue_handler = LogQueueHandler(log_queue)
+    queue_handler.addFilter(DebugSampler(settings.LOG_DEBUG_SAMPLE_EVERY))
+    queue_handler.addFilter(CorrelationIdFilter())
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    # Re-running setup must not stack another exit hook
+    atexit.unregister(stop_logging)
+    atexit.register(stop_logging)
 
     return logging.getLogger(__name__)
@@ -0,0 +1,66 @@
+import time
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional
+from sqlalchemy import text
+from app.core.config import settings
+from app.db.base import get_engine
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """Startup breakdown: one duration per step, measured from `started`"""
+
+    def __init__(self, started: Optional[float] = None):
+        self.started = started if started is not None else time.perf_counter()
+        self.steps: Dict[str, Dict] = {}
+        self.ready = False
+        self.ready_ms = None
+
+    def record(self, name: str, step_started: float, error: Optional[str] = None):
+        step = {"ms": round((time.perf_counter() - step_started) * 1000, 1)}
+        if error:
+            step["error"] = error
+        self.steps[name] = step
+
+    async def warm_up(self, **steps: Callable[[], Awaitable]):
+        """Run warm-up steps concurrently; a failed step is recorded, not fatal"""
+        async def run(name, step):
+            step_started = time.perf_counter()
+            try:
+                await step()
+                self.record(name, step_started)
+            except Exception as e:
+                logger.warning("Warm-up step %s failed: %s", name, e)
+                self.record(name, step_started, error=str(e))
+
+        await asyncio.gather(*(run(name, step) for name, step in steps.items()))
+
+    def mark_ready(self):
+        self.ready = True
+        self.ready_ms = round((time.perf_counter() - self.started) * 1000, 1)
+        logger.info("Ready after %sms: %s", self.ready_ms, self.steps)
+
+    def to_dict(self) -> Dict:
+        return {"ready": self.ready, "total_ms": self.ready_ms, "steps": self.steps}
+
+
+async def warm_database(connections: Optional[int] = None):
+    """Open pooled connections in parallel so the first requests skip the handshake"""
+    engine = get_engine()
+
+    def connect():
+        conn = engine.connect()
+        conn.execute(text("SELECT 1"))
+        return conn
+
+    opened = await asyncio.gather(*(
+        asyncio.to_thread(connect) for _ in range(connections or settings.STARTUP_DB_CONNECTIONS)
+    ))
+    for conn in opened:
+        conn.close()  # back into the pool
+
+
+async def warm_redis(client):
+    await asyncio.to_thread(client.ping)
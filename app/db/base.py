@@ -1,17 +1,35 @@
+import threading
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from app.core.config import settings
 
-# Create database engine
-engine = create_engine(settings.DATABASE_URL)
+_engine = None
+_engine_lock = threading.Lock()
 
-# Create sessionmaker
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Bound to the engine the first time a session is opened
+_session_factory = sessionmaker(autocommit=False, autoflush=False)
 
 # Create declarative base
 Base = declarative_base()
 
+def get_engine() -> Engine:
+    """Create the database engine on first use (safe to call from warm-up threads)"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(settings.DATABASE_URL)
+                _session_factory.configure(bind=engine)
+                _engine = engine
+    return _engine
+
+def SessionLocal() -> Session:
+    """Open a session, creating the engine if needed"""
+    get_engine()
+    return _session_factory()
+
 # Dependency to get DB session
 def get_db():
     db = SessionLocal()
@@ -1,16 +1,24 @@
+import time
+
+# Taken before the heavy imports so /health can report how long they took
+IMPORT_STARTED = time.perf_counter()
+
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
 import logging
 import os
-from app.core.config import LOGGING_CONFIG
 from app.api.routes import router as api_router
+from app.api.dependencies import get_normalization_service, get_queue_service, get_telegram_service
 from app.core.logging import setup_logging
-from app.bot.client import bot  # Make sure this import matches your bot instance location
+from app.core.startup import StartupTimer, warm_database, warm_redis
 
 # Setup logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
+startup = StartupTimer(started=IMPORT_STARTED)
+
 app = FastAPI(
     title="Deal Automator",
     description="Affiliate Marketing Deal Processing System",
@@ -26,20 +34,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.on_event("startup")
 async def setup_webhook():
     """Configure Telegram webhook on startup"""
-    try:
-        # Render sets RENDER_EXTERNAL_HOSTNAME automatically
-        RENDER_HOSTNAME = os.getenv('RENDER_EXTERNAL_HOSTNAME')
-        if RENDER_HOSTNAME:
-            WEBHOOK_URL = f"https://{RENDER_HOSTNAME}/api/webhook/telegram"  # Note: added https://
-            await bot.set_webhook(WEBHOOK_URL)
-            logger.info(f"Webhook set to {WEBHOOK_URL}")
-        else:
-            logger.warning("RENDER_EXTERNAL_HOSTNAME not found - webhook not set")
-    except Exception as e:
-        logger.error(f"Failed to set webhook: {e}")
+    # Render sets RENDER_EXTERNAL_HOSTNAME automatically
+    RENDER_HOSTNAME = os.getenv('RENDER_EXTERNAL_HOSTNAME')
+    if RENDER_HOSTNAME:
+        WEBHOOK_URL = f"https://{RENDER_HOSTNAME}/api/webhook/telegram"  # Note: added https://
+        if not await get_telegram_service().set_webhook(WEBHOOK_URL):
+            raise RuntimeError("Telegram rejected the webhook")
+        logger.info("Webhook set to %s", WEBHOOK_URL)
+    else:
+        logger.warning("RENDER_EXTERNAL_HOSTNAME not found - webhook not set")
+
+@app.on_event("startup")
+async def warm_up():
+    """Build services and open DB, Redis and Telegram connections concurrently.
+
+    Uvicorn only starts accepting requests once this returns, so the first
+    real request does not pay for construction or connection handshakes.
+    """
+    startup.record("imports", IMPORT_STARTED)
+    # Built before the concurrent steps: lru_cache does not stop two threads
+    # from constructing the same service on first use
+    get_queue_service()
+    await startup.warm_up(
+        database=warm_database,
+        redis=lambda: warm_redis(get_queue_service().redis),
+        normalization=lambda: asyncio.to_thread(get_normalization_service),
+        webhook=setup_webhook
+    )
+    startup.mark_ready()
+
+@app.on_event("shutdown")
+async def close_clients():
+    await get_telegram_service().close()
 
 # Include API routes
 app.include_router(api_router, prefix="/api")
@@ -48,10 +76,11 @@ app.include_router(api_router, prefix="/api")
 async def health_check():
     """Health check endpoint"""
     return {
-        "status": "healthy",
-        "version": "1.0.0"
+        "status": "healthy" if startup.ready else "starting",
+        "version": "1.0.0",
+        "startup": startup.to_dict()
     }
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,11 +1,17 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, ARRAY, Boolean, DECIMAL
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Boolean, DECIMAL, Sequence, UniqueConstraint
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.sql import func
+from datetime import datetime
 from app.db.base import Base
 
 class MessageProcessing(Base):
     __tablename__ = "message_processing"
+    __table_args__ = {'postgresql_partition_by': 'RANGE (created_at)'}  # monthly partitions
 
-    id = Column(Integer, primary_key=True)
+    # The primary key is (id, created_at), so SQLAlchemy will not treat id as
+    # autoincrementing unless told; both values are generated client-side so
+    # the row can be reloaded after commit.
+    id = Column(Integer, Sequence("message_processing_id_seq"), primary_key=True, autoincrement=True)
     telegram_message_id = Column(String)
     raw_text = Column(Text)
     status = Column(String(20))  # 'pending', 'processing', 'completed', 'failed'
@@ -13,13 +19,18 @@ class MessageProcessing(Base):
     partner_name = Column(String)
     processed_at = Column(DateTime)
     error_message = Column(Text)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow, server_default=func.now())
+    correlation_id = Column(String(32), index=True)
+    timeline = Column(JSONB)  # stage -> ms offset from created_at
+    attempt_durations = Column(ARRAY(Integer))  # ms per processing attempt
+    total_ms = Column(Integer)  # created_at -> committed
+    sent_at = Column(DateTime)  # when Telegram received it; differs from created_at for backfills
 
 class ParsedDeal(Base):
     __tablename__ = "parsed_deals"
 
     id = Column(Integer, primary_key=True)
-    message_id = Column(Integer, ForeignKey('message_processing.id'))
+    message_id = Column(Integer)  # message_processing.id (partitioned table, so no FK)
     geo = Column(String(2))
     language_code = Column(String(5))
     is_native = Column(Boolean)
@@ -31,7 +42,21 @@ class ParsedDeal(Base):
     conversion_rate = Column(Text)
     conversion_current = Column(Text)
     conversion_details = Column(Text)
-    sources = Column(ARRAY(String))
+    sources = Column(ARRAY(String))  # postgresql ARRAY, for overlap() filters
     funnels = Column(ARRAY(String))
     notion_url = Column(Text)
+    notion_page_id = Column(String(36))
+    expiration_date = Column(DateTime)
+    active_status = Column(String(20), default="Active")  # 'Active', 'Inactive', 'Expired'
+    text_simhash = Column(BigInteger)  # signed 64-bit SimHash of the source message
+    created_at = Column(DateTime, server_default=func.now())
+
+class NormalizationAlias(Base):
+    __tablename__ = "normalization_aliases"
+    __table_args__ = (UniqueConstraint('kind', 'alias', name='uq_normalization_aliases_kind_alias'),)
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(20))  # 'source', 'geo', 'language', 'funnel'
+    alias = Column(String)
+    canonical = Column(String)
     created_at = Column(DateTime, server_default=func.now())
@@ -0,0 +1,58 @@
+import json
+import asyncio
+import logging
+import argparse
+import signal
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.services.retention_service import RetentionService
+
+logger = logging.getLogger(__name__)
+
+class RetentionWorker:
+    def __init__(self):
+        self.retention = RetentionService()
+        self.should_exit = False
+
+    async def shutdown(self, sig):
+        print(f"\nReceived exit signal {sig.name}...")
+        self.should_exit = True
+
+    async def run(self):
+        """Run a retention pass every RETENTION_INTERVAL seconds"""
+        logger.info("Starting retention scheduler...")
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(
+                sig,
+                lambda s=sig: asyncio.create_task(self.shutdown(s))
+            )
+
+        while not self.should_exit:
+            try:
+                # DDL and COPY block, so the pass runs off the event loop
+                summary = await asyncio.to_thread(self.retention.run)
+                logger.info("Retention pass: %s", summary)
+            except Exception as e:
+                logger.error("Retention pass failed: %s", e)
+
+            # Sleep in short steps so shutdown stays responsive
+            for _ in range(settings.RETENTION_INTERVAL):
+                if self.should_exit:
+                    break
+                await asyncio.sleep(1)
+
+        print("Shutdown complete.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain message_processing partitions")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and print its summary")
+    args = parser.parse_args()
+
+    setup_logging()
+    if args.once:
+        summary = RetentionService().run()
+        print(json.dumps(summary, indent=2))
+    else:
+        asyncio.run(RetentionWorker().run())
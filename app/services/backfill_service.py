@@ -0,0 +1,214 @@
+import os
+import re
+import json
+import time
+import uuid
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.message import MessageProcessing
+from app.services.claude_service import is_deal_post
+from app.services.queue_service import QueueService
+
+logger = logging.getLogger(__name__)
+
+MESSAGES_KEY = re.compile(r'"messages"\s*:\s*\[')
+CHUNK_SIZE = 1 << 16
+
+
+def iter_export_messages(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Dict]:
+    """Stream message objects out of a Telegram Desktop JSON export.
+
+    Only the buffer for the message currently being decoded is held in
+    memory, so exports of any size can be imported.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        position = None
+        while position is None:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                raise ValueError(f"No messages array found in {path}")
+            buffer += chunk
+            match = MESSAGES_KEY.search(buffer)
+            if match:
+                position = match.end()
+            else:
+                buffer = buffer[-64:]
+
+        eof = False
+        while True:
+            # Skip separators between array items
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position < len(buffer) and buffer[position] == "]":
+                return
+            try:
+                if position >= len(buffer):
+                    raise json.JSONDecodeError("Need more data", buffer, position)
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+            yield item
+            position = end
+            if position > chunk_size:
+                buffer = buffer[position:]
+                position = 0
+
+
+def message_text(message: Dict) -> str:
+    """Flatten Telegram's text field (plain string or list of entities)"""
+    text = message.get("text", "")
+    if isinstance(text, list):
+        text = "".join(part if isinstance(part, str) else part.get("text", "") for part in text)
+    return text.strip()
+
+
+def message_date(message: Dict) -> Optional[datetime]:
+    """When the message was sent, as naive UTC like the rest of the schema.
+
+    Newer exports carry `date_unixtime`; older ones only have `date`, which
+    is the exporting machine's local time.
+    """
+    try:
+        if message.get("date_unixtime"):
+            return datetime.utcfromtimestamp(int(message["date_unixtime"]))
+        if message.get("date"):
+            return datetime.fromisoformat(message["date"])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+class BackfillImporter:
+    """Bulk-imports the deal posts in a Telegram chat export into the pipeline.
+
+    Rows are inserted with one multi-row INSERT per batch and enqueued with
+    one pipelined round trip on the low-priority backfill queue, which
+    workers only drain when the live queue is empty. Importing pauses while
+    the backfill backlog is above `max_backlog`, and the last imported export
+    message id is checkpointed after each batch so an interrupted import
+    resumes where it stopped. A crash between enqueue and checkpoint can
+    re-import at most one batch; the worker's repost detection makes those
+    replays cheap.
+    """
+
+    def __init__(
+        self,
+        queue_service: Optional[QueueService] = None,
+        batch_size: Optional[int] = None,
+        max_backlog: Optional[int] = None
+    ):
+        self.queue_service = queue_service or QueueService()
+        self.batch_size = batch_size or settings.BACKFILL_BATCH_SIZE
+        self.max_backlog = max_backlog or settings.BACKFILL_MAX_BACKLOG
+
+    def load_checkpoint(self, checkpoint_path: str) -> int:
+        if not os.path.exists(checkpoint_path):
+            return 0
+        with open(checkpoint_path) as f:
+            return json.load(f).get("last_message_id", 0)
+
+    def save_checkpoint(self, checkpoint_path: str, last_message_id: int, imported: int):
+        tmp_path = f"{checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "last_message_id": last_message_id,
+                "imported": imported,
+                "updated_at": datetime.utcnow().isoformat()
+            }, f)
+        os.replace(tmp_path, checkpoint_path)
+
+    def _batches(self, path: str, after_id: int) -> Iterator[List[Dict]]:
+        batch = []
+        for message in iter_export_messages(path):
+            if message.get("type") != "message" or message.get("id", 0) <= after_id:
+                continue
+            # History is mostly chatter; only deal posts are worth a parse
+            text = message_text(message)
+            if not text or not is_deal_post(text):
+                continue
+            batch.append({"id": message["id"], "text": text, "date": message_date(message)})
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _insert_batch(self, db: Session, batch: List[Dict], partner_name: Optional[str]) -> List[Dict]:
+        """Insert one batch of rows and build their queue payloads.
+
+        created_at is the import time, which keeps rows in current partitions
+        until they are processed; the original send time goes in sent_at.
+        """
+        now = datetime.utcnow()
+        rows = [{
+            "telegram_message_id": str(item["id"]),
+            "raw_text": item["text"],
+            "status": "pending",
+            "attempts": 0,
+            "partner_name": partner_name,
+            "correlation_id": uuid.uuid4().hex,
+            "timeline": {"received": 0},
+            "sent_at": item.get("date"),
+            "created_at": now
+        } for item in batch]
+
+        # RETURNING order is not guaranteed to follow VALUES order
+        ids = dict((telegram_message_id, db_id) for db_id, telegram_message_id in db.execute(
+            insert(MessageProcessing).values(rows).returning(MessageProcessing.id, MessageProcessing.telegram_message_id)
+        ).all())
+        db.commit()
+
+        return [{
+            "telegram_message_id": row["telegram_message_id"],
+            "text": row["raw_text"],
+            "db_id": ids[row["telegram_message_id"]],
+            "correlation_id": row["correlation_id"],
+            "backfill": True
+        } for row in rows]
+
+    async def _wait_for_capacity(self):
+        """Hold off while workers still have a large backfill backlog"""
+        while await self.queue_service.get_backfill_size() > self.max_backlog:
+            await asyncio.sleep(1)
+
+    async def run(self, db: Session, path: str, checkpoint_path: str, partner_name: Optional[str] = None) -> Dict:
+        """Import everything after the checkpoint; returns throughput stats"""
+        last_id = self.load_checkpoint(checkpoint_path)
+        if last_id:
+            logger.info("Resuming backfill after message %s", last_id)
+
+        started = time.monotonic()
+        imported = 0
+        for batch in self._batches(path, last_id):
+            await self._wait_for_capacity()
+            payloads = self._insert_batch(db, batch, partner_name)
+            if not await self.queue_service.enqueue_batch(payloads):
+                raise RuntimeError(f"Failed to enqueue batch ending at message {batch[-1]['id']}")
+
+            imported += len(batch)
+            last_id = batch[-1]["id"]
+            self.save_checkpoint(checkpoint_path, last_id, imported)
+
+            elapsed = time.monotonic() - started
+            logger.info("Backfilled %s messages (%.0f msg/s), last id %s", imported, imported / elapsed, last_id)
+
+        elapsed = time.monotonic() - started
+        return {
+            "imported": imported,
+            "last_message_id": last_id,
+            "seconds": round(elapsed, 2),
+            "messages_per_second": round(imported / elapsed, 1) if elapsed else None
+        }
@@ -1,16 +1,63 @@
 import anthropic
 from app.core.config import settings
+from app.db.base import SessionLocal
+from app.services.context_store import ContextStore, create_context_store
+from app.services.deal_query_service import DealQueryService
+from app.services.normalization_service import NormalizationService
+from app.services.telegram_service import StreamingReply, TelegramService
 import logging
 import json
+import re
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+DEAL_QUERY_PHRASES = ["show deals", "current deals", "active deals"]
+SCHEMA_QUERY_PHRASES = ["check column", "verify structure", "database schema"]
+# Partner deal posts always quote a pricing model
+DEAL_POST_PATTERN = re.compile(r"\b(cpa|cpl|crg)\b", re.IGNORECASE)
+# Requests and questions; checked before the pricing model so "show me CPA deals" is a query
+QUESTION_PATTERN = re.compile(
+    r"^\s*(?:show|list|find|search|any|anything|which|what|where|how)\b|\?\s*$",
+    re.IGNORECASE
+)
+DEAL_WORD_PATTERN = re.compile(r"\b(?:deals?|offers?)\b", re.IGNORECASE)
+
+
+def is_deal_query(text: str) -> bool:
+    """True for lookups the deal query engine can answer"""
+    if any(phrase in text.lower() for phrase in DEAL_QUERY_PHRASES):
+        return True
+    return bool(QUESTION_PATTERN.search(text) and DEAL_WORD_PATTERN.search(text))
+
+
+def is_deal_post(text: str) -> bool:
+    """True for partner deal posts, False for questions and conversation"""
+    if QUESTION_PATTERN.search(text) or is_deal_query(text):
+        return False
+    if any(phrase in text.lower() for phrase in SCHEMA_QUERY_PHRASES):
+        return False
+    return bool(DEAL_POST_PATTERN.search(text))
+
 class ClaudeService:
-    def __init__(self):
-        self.client = anthropic.Client(api_key=settings.ANTHROPIC_API_KEY)
-        self.conversation_context = {}
+    def __init__(
+        self,
+        context_store: Optional[ContextStore] = None,
+        telegram_service: Optional[TelegramService] = None
+    ):
+        self.client = anthropic.Client(
+            api_key=settings.ANTHROPIC_API_KEY,
+            base_url=settings.ANTHROPIC_BASE_URL
+        )
+        self.async_client = anthropic.AsyncAnthropic(
+            api_key=settings.ANTHROPIC_API_KEY,
+            base_url=settings.ANTHROPIC_BASE_URL
+        )
+        self.context_store = context_store or create_context_store()
+        self.telegram_service = telegram_service
+        self.normalization_service = NormalizationService()
+        self.deal_query_service = DealQueryService(normalization_service=self.normalization_service)
         self.system_prompt = """You are a specialized parser and conversational agent for affiliate marketing deals. You can:
 1. Parse and extract structured deal information
 2. Handle natural language queries about deals
@@ -18,32 +65,36 @@ class ClaudeService:
 4. Verify and validate deal information
 5. Provide clear feedback and suggestions"""
 
-    async def handle_message(self, user_id: str, message: str) -> Dict:
-        """Handle incoming messages and maintain conversation context"""
+    async def handle_message(self, user_id: str, message: str, chat_id: Optional[int] = None) -> Dict:
+        """Handle incoming messages and maintain conversation context.
+
+        When `chat_id` is given the reply is sent to that Telegram chat;
+        conversational replies are streamed into it if streaming is enabled.
+        """
         try:
-            # Update conversation context
-            if user_id not in self.conversation_context:
-                self.conversation_context[user_id] = []
-            
             # Add message to context
-            self.conversation_context[user_id].append({
-                "role": "user",
-                "content": message,
-                "timestamp": datetime.now().isoformat()
-            })
+            await self.context_store.append(user_id, "user", message)
 
             # Detect message intent
-            if any(query in message.lower() for query in ["show deals", "current deals", "active deals"]):
-                return await self._handle_deal_query(message)
-            elif any(query in message.lower() for query in ["check column", "verify structure", "database schema"]):
-                return await self._handle_schema_query(message)
+            if is_deal_query(message):
+                result = await self._handle_deal_query(message)
+            elif any(query in message.lower() for query in SCHEMA_QUERY_PHRASES):
+                result = await self._handle_schema_query(message)
             elif "parse deal" in message.lower():
-                return await self.parse_deal(message)
+                result = await self.parse_deal(message)
+            elif chat_id is not None and settings.STREAM_REPLIES:
+                return await self._stream_general_conversation(user_id, message, chat_id)
             else:
-                return await self._handle_general_conversation(user_id, message)
+                result = await self._handle_general_conversation(user_id, message)
+
+            if chat_id is not None:
+                reply = self._reply_text(result)
+                if reply:
+                    await self._get_telegram_service().send_message(chat_id, reply)
+            return result
 
         except Exception as e:
-            logger.error(f"Error handling message: {str(e)}")
+            logger.error("Error handling message: %s", e)
             return {"error": "Failed to process message", "details": str(e)}
 
     async def parse_deal(self, text: str) -> Dict:
@@ -75,11 +126,11 @@ class ClaudeService:
                 return None
                 
             except (IndexError, KeyError, json.JSONDecodeError) as e:
-                logger.error(f"Failed to parse Claude response: {str(e)}")
+                logger.error("Failed to parse Claude response: %s", e)
                 return None
                 
         except Exception as e:
-            logger.error(f"Error calling Claude API: {str(e)}")
+            logger.error("Error calling Claude API: %s", e)
             return None
 
     async def _validate_parsed_data(self, data: Dict) -> Dict:
@@ -103,8 +154,8 @@ class ClaudeService:
                 validation_errors.append("Invalid expiration date format")
 
         # Clean and standardize data
-        if 'sources' in data and isinstance(data['sources'], list):
-            data['sources'] = [self._standardize_source(s) for s in data['sources']]
+        self.normalization_service.normalize_deal(data)
+        validation_errors.extend(data.get('validation_errors', []))
 
         if validation_errors:
             logger.error("Validation errors: " + ", ".join(validation_errors))
@@ -114,11 +165,7 @@ class ClaudeService:
 
     def _standardize_source(self, source: str) -> str:
         """Standardize traffic source names"""
-        source = source.lower().strip()
-        for standard, variants in settings.SOURCE_MAPPING.items():
-            if source in [v.lower() for v in variants]:
-                return standard
-        return source.upper()
+        return self.normalization_service.normalize_source(source)
 
     def _generate_verification_summary(self, data: Dict) -> Dict:
         """Generate human-readable verification summary"""
@@ -133,10 +180,36 @@ class ClaudeService:
             "requires_attention": bool(data.get('validation_errors', []))
         }
 
+    def _get_telegram_service(self) -> TelegramService:
+        if self.telegram_service is None:
+            self.telegram_service = TelegramService()
+        return self.telegram_service
+
+    def _reply_text(self, result: Optional[Dict]) -> Optional[str]:
+        """Render a non-streamed result as a Telegram reply"""
+        if not result:
+            return None
+        if result.get("error"):
+            return f"Sorry, that failed: {result['error']}"
+        if result.get("type") == "deal_query":
+            return self.deal_query_service.format_results(result)
+        if result.get("type") == "conversation":
+            return result["response"]
+        if "verification" in result:
+            verification = result["verification"]
+            return "\n".join([verification["summary"]] + verification["key_points"] + verification["warnings"])
+        return None
+
     async def _handle_deal_query(self, message: str) -> Dict:
-        """Handle queries about current deals"""
-        # Implementation would interact with NotionService to fetch active deals
-        pass
+        """Handle queries about current deals from the local parsed_deals index"""
+        db = SessionLocal()
+        try:
+            return await self.deal_query_service.query_deals(db, message)
+        except Exception as e:
+            logger.error("Error querying deals: %s", e)
+            return {"error": "Failed to query deals"}
+        finally:
+            db.close()
 
     async def _handle_schema_query(self, message: str) -> Dict:
         """Handle database schema verification queries"""
@@ -146,8 +219,10 @@ class ClaudeService:
     async def _handle_general_conversation(self, user_id: str, message: str) -> Dict:
         """Handle general conversation with context"""
         try:
-            # Get recent conversation context
-            recent_context = self.conversation_context[user_id][-5:]  # Last 5 messages
+            # Get recent conversation context within the token budget
+            recent_context = await self.context_store.get_context(user_id)
+            if not recent_context:
+                recent_context = [{"role": "user", "content": message}]
             
             response = self.client.messages.create(
                 model="claude-3-opus-20240229",
@@ -160,11 +235,51 @@ class ClaudeService:
                 } for msg in recent_context]
             )
             
+            reply = "".join(block.text for block in response.content if getattr(block, "text", None))
+            await self.context_store.append(user_id, "assistant", reply)
+            
             return {
                 "type": "conversation",
-                "response": response.content
+                "response": reply
             }
             
         except Exception as e:
-            logger.error(f"Error in conversation handling: {str(e)}")
+            logger.error("Error in conversation handling: %s", e)
+            return {"error": "Failed to process conversation"}
+
+    async def _stream_general_conversation(self, user_id: str, message: str, chat_id: int) -> Dict:
+        """Stream a conversational reply into a Telegram chat as it is generated"""
+        reply = StreamingReply(self._get_telegram_service(), chat_id)
+        try:
+            recent_context = await self.context_store.get_context(user_id)
+            if not recent_context:
+                recent_context = [{"role": "user", "content": message}]
+
+            async with self.async_client.messages.stream(
+                model="claude-3-opus-20240229",
+                max_tokens=1000,
+                temperature=0.7,
+                system=self.system_prompt,
+                messages=[{
+                    "role": msg["role"],
+                    "content": msg["content"]
+                } for msg in recent_context]
+            ) as stream:
+                async for text in stream.text_stream:
+                    await reply.push(text)
+
+            text = await reply.finish()
+            await self.context_store.append(user_id, "assistant", text)
+
+            return {
+                "type": "conversation",
+                "response": text,
+                "streamed": True,
+                "telegram_message_id": reply.message_id
+            }
+
+        except Exception as e:
+            logger.error("Error in streamed conversation: %s", e)
+            if reply.text:
+                await reply.finish()
             return {"error": "Failed to process conversation"}
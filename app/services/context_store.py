@@ -0,0 +1,183 @@
+import redis
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rough chars-per-token ratio for English chat text; good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for context budgeting"""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def trim_to_token_budget(messages: List[Dict], token_budget: int) -> List[Dict]:
+    """Keep the most recent messages that fit in the token budget.
+
+    The newest message is always kept. Leading assistant turns are dropped
+    because the Messages API expects the conversation to open with the user.
+    """
+    kept = []
+    used = 0
+    for message in reversed(messages):
+        tokens = estimate_tokens(message["content"])
+        if kept and used + tokens > token_budget:
+            break
+        kept.append(message)
+        used += tokens
+    kept.reverse()
+
+    while len(kept) > 1 and kept[0]["role"] != "user":
+        kept.pop(0)
+    return kept
+
+
+class ContextStore(ABC):
+    """Per-user conversation history with bounded size.
+
+    A user's history expires after `ttl_seconds` without reads or writes.
+    """
+
+    def __init__(self, max_messages: int, ttl_seconds: int):
+        self.max_messages = max_messages
+        self.ttl_seconds = ttl_seconds
+
+    @abstractmethod
+    async def append(self, user_id: str, role: str, content: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def get_messages(self, user_id: str) -> List[Dict]:
+        ...
+
+    @abstractmethod
+    async def clear(self, user_id: str) -> bool:
+        ...
+
+    async def get_context(self, user_id: str, token_budget: Optional[int] = None) -> List[Dict]:
+        """Recent messages for a user, trimmed to the token budget"""
+        messages = await self.get_messages(user_id)
+        return trim_to_token_budget(messages, token_budget or settings.CONTEXT_TOKEN_BUDGET)
+
+    def _entry(self, role: str, content: str) -> Dict:
+        return {"role": role, "content": content, "timestamp": time.time()}
+
+
+class InMemoryContextStore(ContextStore):
+    """Process-local store with LRU eviction across users and per-user TTL.
+
+    Every access moves the user to the end and refreshes `last_seen`, so the
+    dict stays ordered by last activity and eviction only inspects the front.
+    """
+
+    def __init__(self, max_users: int, max_messages: int, ttl_seconds: int):
+        super().__init__(max_messages, ttl_seconds)
+        self.max_users = max_users
+        self._users = OrderedDict()  # user_id -> (last_seen, deque of messages)
+
+    def _evict(self, now: float):
+        """Drop expired users (oldest first) and anything beyond max_users"""
+        while self._users:
+            user_id, (last_seen, _) = next(iter(self._users.items()))
+            if now - last_seen < self.ttl_seconds and len(self._users) <= self.max_users:
+                break
+            self._users.popitem(last=False)
+
+    async def append(self, user_id: str, role: str, content: str) -> bool:
+        now = time.time()
+        last_seen, messages = self._users.pop(user_id, (now, None))
+        if messages is None or now - last_seen >= self.ttl_seconds:
+            messages = deque(maxlen=self.max_messages)
+        messages.append(self._entry(role, content))
+        self._users[user_id] = (now, messages)
+        self._evict(now)
+        return True
+
+    async def get_messages(self, user_id: str) -> List[Dict]:
+        now = time.time()
+        self._evict(now)
+        entry = self._users.pop(user_id, None)
+        if not entry:
+            return []
+        last_seen, messages = entry
+        if now - last_seen >= self.ttl_seconds:
+            return []
+        self._users[user_id] = (now, messages)
+        return list(messages)
+
+    async def clear(self, user_id: str) -> bool:
+        self._users.pop(user_id, None)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+
+class RedisContextStore(ContextStore):
+    """Redis-backed store shared by every app and worker process.
+
+    Each user is a capped list whose expiry is reset on every read and
+    write, so memory is bounded by active users rather than all users.
+    """
+
+    def __init__(self, max_messages: int, ttl_seconds: int, redis_client=None):
+        super().__init__(max_messages, ttl_seconds)
+        self.redis = redis_client or redis.from_url(settings.REDIS_URL)
+        self.key_prefix = "conversation_context"
+
+    def _key(self, user_id: str) -> str:
+        return f"{self.key_prefix}:{user_id}"
+
+    async def append(self, user_id: str, role: str, content: str) -> bool:
+        try:
+            key = self._key(user_id)
+            pipe = self.redis.pipeline()
+            pipe.rpush(key, json.dumps(self._entry(role, content)))
+            pipe.ltrim(key, -self.max_messages, -1)
+            pipe.expire(key, self.ttl_seconds)
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.error("Failed to store conversation context: %s", e)
+            return False
+
+    async def get_messages(self, user_id: str) -> List[Dict]:
+        try:
+            key = self._key(user_id)
+            pipe = self.redis.pipeline()
+            pipe.lrange(key, 0, -1)
+            pipe.expire(key, self.ttl_seconds)
+            items, _ = pipe.execute()
+            return [json.loads(item) for item in items]
+        except Exception as e:
+            logger.error("Failed to load conversation context: %s", e)
+            return []
+
+    async def clear(self, user_id: str) -> bool:
+        try:
+            self.redis.delete(self._key(user_id))
+            return True
+        except Exception as e:
+            logger.error("Failed to clear conversation context: %s", e)
+            return False
+
+
+def create_context_store() -> ContextStore:
+    """Build the context store selected by CONTEXT_BACKEND"""
+    if settings.CONTEXT_BACKEND == "memory":
+        return InMemoryContextStore(
+            max_users=settings.CONTEXT_MAX_USERS,
+            max_messages=settings.CONTEXT_MAX_MESSAGES,
+            ttl_seconds=settings.CONTEXT_TTL_SECONDS
+        )
+    return RedisContextStore(
+        max_messages=settings.CONTEXT_MAX_MESSAGES,
+        ttl_seconds=settings.CONTEXT_TTL_SECONDS
+    )
@@ -0,0 +1,244 @@
+import re
+import time
+import redis
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.core.config import settings, SOURCE_MAPPING
+from app.models.message import ParsedDeal
+from app.services.normalization_service import NormalizationService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+PRICING_PATTERN = re.compile(r"\b(cpa|cpl|crg)\b", re.IGNORECASE)
+BETWEEN_PATTERN = re.compile(r"\bbetween\s*\$?(\d+(?:\.\d+)?)\s*\$?\s*(?:and|-|to)\s*\$?(\d+(?:\.\d+)?)", re.IGNORECASE)
+# "N-M" only counts as a price range next to a currency sign or pricing word, not in dates or ids
+RANGE_PATTERN = re.compile(
+    r"(?:\b(?:cpa|cpl|price|payout)\s*:?\s*\$?|\$)\s*(\d+(?:\.\d+)?)\s*\$?\s*-\s*\$?\s*(\d+(?:\.\d+)?)"
+    r"|\b(\d+(?:\.\d+)?)\s*\$\s*-\s*\$?\s*(\d+(?:\.\d+)?)",
+    re.IGNORECASE
+)
+MAX_PATTERN = re.compile(r"(?:\bunder|\bbelow|\bless than|<=?|\bmax(?:imum)?|\bup to)\s*\$?(\d+(?:\.\d+)?)", re.IGNORECASE)
+# "over"/"from" also precede dates and counts, so they need a currency sign or pricing word too
+MIN_PATTERN = re.compile(
+    r"(?:\babove|\bmore than|>=?|\bmin(?:imum)?|\bat least)\s*\$?(\d+(?:\.\d+)?)"
+    r"|(?:\bover|\bfrom)\s*(?:\$\s*(\d+(?:\.\d+)?)|(\d+(?:\.\d+)?)\s*\$)"
+    r"|\b(?:cpa|cpl|price|payout)\s*:?\s*(?:over|from)\s*(\d+(?:\.\d+)?)",
+    re.IGNORECASE
+)
+GEO_PATTERN = re.compile(r"\b([A-Z]{2})\b")
+FUNNEL_PATTERN = re.compile(
+    r"\bfunnels?\s*[:=]?\s*(?:\"([^\"]+)\"|([A-Za-z0-9][\w\- ]*?)\s*(?:,|;|$|\b(?:and|with|top|last|in|for)\b))",
+    re.IGNORECASE
+)
+LIMIT_PATTERN = re.compile(r"\b(?:top|last|first|latest)\s+(\d+)\b", re.IGNORECASE)
+INCLUDE_EXPIRED_PATTERN = re.compile(r"\b(all deals|including expired|incl\.? expired|expired deals)\b", re.IGNORECASE)
+SOURCE_PATTERNS = [
+    (standard, re.compile(r"\b(?:" + "|".join(re.escape(v) for v in [standard] + variants) + r")\b", re.IGNORECASE))
+    for standard, variants in SOURCE_MAPPING.items()
+]
+# Two-letter tokens that look like geos but are traffic sources or filler
+NON_GEO_TOKENS = {"FB", "GG", "OK", "OR", "ON"}
+# Real country codes that are also English words; only filler in all-caps messages
+WORD_GEO_TOKENS = {"AI", "AT", "IN", "IS", "ME", "MY", "TO"}
+
+
+class DealQueryService:
+    """Answers natural-language deal lookups from parsed_deals.
+
+    Common filters are extracted with regular expressions and translated to
+    indexed SQL, so no LLM or Notion round trip is needed. Results are kept in
+    a small LRU cache keyed by a Redis generation counter that the worker
+    and the expiration sweeper bump whenever deals change, which invalidates
+    every process at once. Entries also expire after `cache_ttl` seconds,
+    since active-only results change as expiration dates pass.
+    """
+
+    def __init__(
+        self,
+        redis_client=None,
+        normalization_service: Optional[NormalizationService] = None,
+        cache_size: int = 256,
+        cache_ttl: Optional[float] = None
+    ):
+        self.redis = redis_client or redis.from_url(settings.REDIS_URL)
+        self.normalization_service = normalization_service or NormalizationService(redis_client=self.redis)
+        self.generation_key = "parsed_deals:generation"
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl if cache_ttl is not None else settings.DEAL_QUERY_CACHE_TTL
+        self._cache = OrderedDict()
+
+    def parse_filters(self, message: str) -> Dict:
+        """Extract structured filters from a natural-language query"""
+        filters = {}
+
+        skip = NON_GEO_TOKENS | WORD_GEO_TOKENS if message.isupper() else NON_GEO_TOKENS
+        geos = {
+            self.normalization_service.normalize_geo(g)
+            for g in GEO_PATTERN.findall(message) if g not in skip
+        }
+        geos.discard(None)
+        if geos:
+            filters["geos"] = sorted(geos)
+
+        pricing = {p.upper() for p in PRICING_PATTERN.findall(message)}
+        if pricing:
+            filters["pricing_models"] = sorted(pricing)
+
+        between = BETWEEN_PATTERN.search(message) or RANGE_PATTERN.search(message)
+        if between:
+            low, high = sorted(float(value) for value in between.groups() if value is not None)
+            filters["min_price"], filters["max_price"] = low, high
+        else:
+            upper = MAX_PATTERN.search(message)
+            lower = MIN_PATTERN.search(message)
+            if upper:
+                filters["max_price"] = float(upper.group(1))
+            if lower:
+                filters["min_price"] = float(next(value for value in lower.groups() if value is not None))
+
+        sources = [standard for standard, pattern in SOURCE_PATTERNS if pattern.search(message)]
+        if sources:
+            filters["sources"] = sorted(sources)
+
+        funnels = [(quoted or bare).strip() for quoted, bare in FUNNEL_PATTERN.findall(message)]
+        funnels = [self.normalization_service.normalize_funnel(f) for f in funnels if f]
+        if funnels:
+            filters["funnels"] = sorted(set(funnels))
+
+        limit = LIMIT_PATTERN.search(message)
+        filters["limit"] = min(int(limit.group(1)), MAX_LIMIT) if limit else DEFAULT_LIMIT
+        filters["active_only"] = not INCLUDE_EXPIRED_PATTERN.search(message)
+        return filters
+
+    def build_query(self, db: Session, filters: Dict):
+        """Translate filters into a query over indexed parsed_deals columns"""
+        query = db.query(ParsedDeal)
+
+        if filters.get("geos"):
+            query = query.filter(ParsedDeal.geo.in_(filters["geos"]))
+
+        pricing_models = set(filters.get("pricing_models", []))
+        if "CRG" in pricing_models:
+            query = query.filter(ParsedDeal.crg_percentage.isnot(None))
+            pricing_models.discard("CRG")
+        if pricing_models:
+            query = query.filter(ParsedDeal.pricing_model.in_(sorted(pricing_models)))
+
+        price_columns = []
+        if not pricing_models or "CPA" in pricing_models:
+            price_columns.append(ParsedDeal.cpa_amount)
+        if not pricing_models or "CPL" in pricing_models:
+            price_columns.append(ParsedDeal.cpl_amount)
+        if "min_price" in filters or "max_price" in filters:
+            conditions = []
+            for column in price_columns:
+                condition = column.isnot(None)
+                if "min_price" in filters:
+                    condition = condition & (column >= filters["min_price"])
+                if "max_price" in filters:
+                    condition = condition & (column <= filters["max_price"])
+                conditions.append(condition)
+            query = query.filter(or_(*conditions))
+
+        if filters.get("sources"):
+            query = query.filter(ParsedDeal.sources.overlap(filters["sources"]))
+        if filters.get("funnels"):
+            query = query.filter(ParsedDeal.funnels.overlap(filters["funnels"]))
+
+        if filters.get("active_only", True):
+            query = query.filter(or_(
+                ParsedDeal.expiration_date.is_(None),
+                ParsedDeal.expiration_date >= datetime.utcnow()
+            ))
+
+        return query.order_by(ParsedDeal.created_at.desc()).limit(filters.get("limit", DEFAULT_LIMIT))
+
+    def _format_deal(self, deal: ParsedDeal) -> Dict:
+        return {
+            "id": deal.id,
+            "geo": deal.geo,
+            "language_code": deal.language_code,
+            "pricing_model": deal.pricing_model,
+            "cpa_amount": float(deal.cpa_amount) if deal.cpa_amount is not None else None,
+            "crg_percentage": float(deal.crg_percentage) if deal.crg_percentage is not None else None,
+            "cpl_amount": float(deal.cpl_amount) if deal.cpl_amount is not None else None,
+            "sources": deal.sources or [],
+            "funnels": deal.funnels or [],
+            "notion_url": deal.notion_url,
+            "expiration_date": deal.expiration_date.isoformat() if deal.expiration_date else None,
+            "created_at": deal.created_at.isoformat() if deal.created_at else None
+        }
+
+    def format_results(self, result: Dict) -> str:
+        """Render a query_deals result as a chat reply"""
+        if not result["deals"]:
+            return "No matching deals found."
+        lines = [f"Found {result['count']} deal(s):"]
+        for deal in result["deals"]:
+            prices = []
+            if deal["cpa_amount"] is not None:
+                prices.append(f"CPA {deal['cpa_amount']:g}$")
+            if deal["cpl_amount"] is not None:
+                prices.append(f"CPL {deal['cpl_amount']:g}$")
+            if deal["crg_percentage"] is not None:
+                prices.append(f"{deal['crg_percentage']:g}% CRG")
+            parts = [deal["geo"] or "??", deal["language_code"] or "", " + ".join(prices), ", ".join(deal["sources"])]
+            line = " | ".join(part for part in parts if part)
+            if deal["notion_url"]:
+                line += f"\n{deal['notion_url']}"
+            lines.append(f"- {line}")
+        return "\n".join(lines)
+
+    def _generation(self) -> Optional[int]:
+        try:
+            return int(self.redis.get(self.generation_key) or 0)
+        except Exception as e:
+            logger.warning("Deal query cache disabled, generation unavailable: %s", e)
+            return None
+
+    def _cache_key(self, generation: int, filters: Dict) -> Tuple:
+        return (generation,) + tuple(
+            (key, tuple(value) if isinstance(value, list) else value)
+            for key, value in sorted(filters.items())
+        )
+
+    def invalidate_cache(self) -> bool:
+        """Bump the shared generation so every process drops cached results"""
+        try:
+            self.redis.incr(self.generation_key)
+            return True
+        except Exception as e:
+            logger.error("Failed to invalidate deal query cache: %s", e)
+            return False
+
+    async def query_deals(self, db: Session, message: str) -> Dict:
+        """Answer a natural-language deal query"""
+        filters = self.parse_filters(message)
+        generation = self._generation()
+        cache_key = self._cache_key(generation, filters) if generation is not None else None
+
+        cached = self._cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < self.cache_ttl:
+            self._cache.move_to_end(cache_key)
+            deals = cached[1]
+        else:
+            deals = [self._format_deal(deal) for deal in self.build_query(db, filters).all()]
+            if cache_key is not None:
+                self._cache[cache_key] = (time.monotonic(), deals)
+                self._cache.move_to_end(cache_key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return {
+            "type": "deal_query",
+            "filters": filters,
+            "count": len(deals),
+            "deals": deals
+        }
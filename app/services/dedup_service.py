@@ -0,0 +1,217 @@
+import re
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from difflib import SequenceMatcher
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.message import MessageProcessing, ParsedDeal
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\d+(?:[.,]\d+)?|[^\W\d_]+", re.UNICODE)
+NUMBER_PATTERN = re.compile(r"^\d+(?:[.,]\d+)?$")
+
+BANDS = 4
+BAND_BITS = 64 // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+# Deal fields a changed number in a repost can be mapped back onto
+NUMERIC_FIELDS = ["cpa_amount", "cpl_amount", "crg_percentage"]
+TEXT_FIELDS = ["conversion_rate", "deduction_limit", "conversion_current"]
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word unigrams and bigrams, with numbers masked.
+
+    Masking numbers means a repost that only changes prices or percentages
+    hashes identically, and the diff step decides what changed.
+    """
+    tokens = ["#" if NUMBER_PATTERN.match(token) else token for token in tokenize(text)]
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    if not features:
+        return 0
+
+    # Per-bit majority vote, counted column-wise over the binary strings
+    rows = [
+        format(int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big"), "064b")
+        for feature in features
+    ]
+    threshold = len(rows) / 2
+    bits = "".join("1" if column.count("1") > threshold else "0" for column in zip(*rows))
+    return int(bits, 2)
+
+
+def to_signed(value: int) -> int:
+    """Store an unsigned 64-bit hash in a BIGINT column"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+def _as_decimal(value) -> Optional[Decimal]:
+    try:
+        return Decimal(str(value).replace(",", "."))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+class SimHashIndex:
+    """Banded in-memory SimHash index; exact lookups for distance < BANDS.
+
+    With 4 bands of 16 bits, any two hashes within Hamming distance 3 share
+    at least one identical band, so a lookup only inspects the few deals in
+    four buckets.
+    """
+
+    def __init__(self):
+        self.hashes = {}
+        self.buckets = {}
+
+    def _bands(self, value: int):
+        return [(band, value >> (band * BAND_BITS) & BAND_MASK) for band in range(BANDS)]
+
+    def add(self, deal_id: int, value: int):
+        self.remove(deal_id)
+        self.hashes[deal_id] = value
+        for key in self._bands(value):
+            self.buckets.setdefault(key, set()).add(deal_id)
+
+    def remove(self, deal_id: int):
+        value = self.hashes.pop(deal_id, None)
+        if value is None:
+            return
+        for key in self._bands(value):
+            bucket = self.buckets.get(key)
+            if bucket:
+                bucket.discard(deal_id)
+                if not bucket:
+                    del self.buckets[key]
+
+    def nearest(self, value: int, max_distance: int) -> Optional[Tuple[int, int]]:
+        """Closest (deal_id, distance) within max_distance, newest deal on ties"""
+        candidates: Set[int] = set()
+        for key in self._bands(value):
+            candidates |= self.buckets.get(key, set())
+
+        best = None
+        for deal_id in candidates:
+            distance = (self.hashes[deal_id] ^ value).bit_count()
+            if distance <= max_distance and (best is None or (distance, -deal_id) < (best[1], -best[0])):
+                best = (deal_id, distance)
+        return best
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+
+class DedupService:
+    """Detects reposted deals and works out which fields changed.
+
+    The index holds recent `parsed_deals.text_simhash` values and is topped up
+    incrementally by id, so each worker sees deals stored by the others. Only
+    active deals match: a repost of an expired deal is parsed as a new deal,
+    which gives it a fresh page and expiration date.
+    """
+
+    def __init__(self, max_distance: Optional[int] = None, window_days: Optional[int] = None):
+        self.max_distance = max_distance if max_distance is not None else settings.DEDUP_MAX_DISTANCE
+        self.window_days = window_days or settings.DEDUP_WINDOW_DAYS
+        self.index = SimHashIndex()
+        self._last_id = 0
+
+    def refresh(self, db: Session) -> int:
+        """Load deals stored since the last refresh"""
+        query = db.query(ParsedDeal.id, ParsedDeal.text_simhash, ParsedDeal.active_status).filter(
+            ParsedDeal.id > self._last_id,
+            ParsedDeal.text_simhash.isnot(None)
+        )
+        if not self._last_id:
+            query = query.filter(ParsedDeal.created_at >= datetime.utcnow() - timedelta(days=self.window_days))
+
+        rows = query.order_by(ParsedDeal.id).all()
+        for deal_id, value, active_status in rows:
+            if active_status != "Expired":
+                self.index.add(deal_id, to_unsigned(value))
+            self._last_id = deal_id
+        return len(rows)
+
+    def _is_active(self, deal: ParsedDeal) -> bool:
+        if deal.active_status == "Expired":
+            return False
+        return deal.expiration_date is None or deal.expiration_date >= datetime.utcnow()
+
+    def find_duplicate(self, db: Session, text: str) -> Optional[Tuple[ParsedDeal, int]]:
+        """Return (prior deal, distance) for a near-duplicate of `text`, if any"""
+        self.refresh(db)
+        value = simhash(text)
+        while True:
+            match = self.index.nearest(value, self.max_distance)
+            if not match:
+                return None
+            deal = db.query(ParsedDeal).filter_by(id=match[0]).first()
+            if deal is not None and deal.notion_url and self._is_active(deal):
+                return deal, match[1]
+            # Deleted, page-less or expired deals never match again
+            self.index.remove(match[0])
+
+    def previous_text(self, db: Session, deal: ParsedDeal) -> Optional[str]:
+        """Raw text the deal was last parsed from (None once archived)"""
+        message = db.query(MessageProcessing.raw_text).filter_by(id=deal.message_id).first()
+        return message.raw_text if message else None
+
+    def diff(self, old_text: str, new_text: str, deal: ParsedDeal) -> Optional[Dict]:
+        """Map changed numbers in a repost onto deal fields.
+
+        Returns the changed fields ({} for an identical repost), or None when
+        a change cannot be attributed to exactly one field and the message
+        needs a full parse.
+        """
+        old_tokens, new_tokens = tokenize(old_text), tokenize(new_text)
+        changes = {}
+        matcher = SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                continue
+            old_part, new_part = old_tokens[i1:i2], new_tokens[j1:j2]
+            if tag != "replace" or len(old_part) != len(new_part):
+                return None
+            for old_token, new_token in zip(old_part, new_part):
+                if not (NUMBER_PATTERN.match(old_token) and NUMBER_PATTERN.match(new_token)):
+                    return None
+                change = self._attribute(deal, old_token, new_token, changes)
+                if change is None:
+                    return None
+                changes.update(change)
+        return changes
+
+    def _attribute(self, deal: ParsedDeal, old_token: str, new_token: str, changes: Dict) -> Optional[Dict]:
+        """Find the single deal field holding `old_token` and set it to `new_token`"""
+        old_value, new_value = _as_decimal(old_token), _as_decimal(new_token)
+        matches = []
+        for field in NUMERIC_FIELDS:
+            current = getattr(deal, field)
+            if field not in changes and current is not None and _as_decimal(current) == old_value:
+                matches.append((field, float(new_value)))
+        for field in TEXT_FIELDS:
+            current = getattr(deal, field)
+            if field not in changes and current and re.search(rf"(?<![\d.,]){re.escape(old_token)}(?![\d.,]*\d)", current):
+                matches.append((field, re.sub(rf"(?<![\d.,]){re.escape(old_token)}(?![\d.,]*\d)", new_token, current, count=1)))
+        if len(matches) != 1:
+            return None
+        return dict(matches)
+
+    def remember(self, deal: ParsedDeal, text: str):
+        """Record the hash for a stored deal and index it immediately"""
+        value = simhash(text)
+        deal.text_simhash = to_signed(value)
+        if deal.id:
+            self.index.add(deal.id, value)
@@ -0,0 +1,89 @@
+import logging
+from datetime import datetime
+from typing import Dict, Optional, Set
+from sqlalchemy.orm import Session
+from app.core.config import settings, RATE_LIMITS
+from app.core.rate_limit import RateLimiter
+from app.models.message import ParsedDeal
+from app.services.deal_query_service import DealQueryService
+from app.services.notion_service import NotionService, page_id_from_url
+
+logger = logging.getLogger(__name__)
+
+# Give up on a sweep after this many Notion failures in a row
+MAX_CONSECUTIVE_FAILURES = 3
+
+
+class ExpirationSweeper:
+    """Expires deals locally and pushes the status change to Notion.
+
+    Candidates come from one indexed query on parsed_deals (partial index on
+    expiration_date where active_status = 'Active'); Notion is only written
+    to, never scanned. Updates are paced by RATE_LIMITS['notion'] and
+    committed per batch, and rows are claimed with SKIP LOCKED so several
+    sweepers never update the same page twice. Every batch that expires
+    deals also invalidates the cached deal query results.
+    """
+
+    def __init__(
+        self,
+        notion_service: Optional[NotionService] = None,
+        deal_query_service: Optional[DealQueryService] = None,
+        batch_size: Optional[int] = None
+    ):
+        self.notion_service = notion_service or NotionService()
+        self.deal_query_service = deal_query_service or DealQueryService()
+        self.batch_size = batch_size or settings.EXPIRATION_BATCH_SIZE
+        self.limiter = RateLimiter(RATE_LIMITS['notion']['requests_per_second'])
+
+    def _claim_batch(self, db: Session, now: datetime, skip: Set[int]):
+        query = db.query(ParsedDeal).filter(
+            ParsedDeal.active_status == "Active",
+            ParsedDeal.expiration_date < now
+        )
+        if skip:
+            query = query.filter(ParsedDeal.id.notin_(skip))
+        return (
+            query.order_by(ParsedDeal.expiration_date)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+    async def sweep(self, db: Session) -> Dict:
+        """Expire every overdue deal; returns counts for the pass"""
+        now = datetime.utcnow()
+        expired = 0
+        failed: Set[int] = set()
+        consecutive_failures = 0
+
+        while consecutive_failures < MAX_CONSECUTIVE_FAILURES:
+            deals = self._claim_batch(db, now, failed)
+            if not deals:
+                break
+
+            batch_expired = 0
+            for deal in deals:
+                page_id = deal.notion_page_id or page_id_from_url(deal.notion_url)
+                if page_id:
+                    await self.limiter.acquire()
+                    if not await self.notion_service.update_active_status(page_id, "Expired"):
+                        failed.add(deal.id)
+                        consecutive_failures += 1
+                        if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                            self.limiter.backoff(RATE_LIMITS['notion']['retry_after'])
+                            break
+                        continue
+                deal.active_status = "Expired"
+                batch_expired += 1
+                consecutive_failures = 0
+
+            # Commit per batch; releases the row locks claimed above
+            db.commit()
+            if batch_expired:
+                expired += batch_expired
+                self.deal_query_service.invalidate_cache()
+
+        if failed:
+            logger.warning("Expiration sweep left %s deals active after Notion failures", len(failed))
+        return {"expired": expired, "failed": len(failed)}
@@ -0,0 +1,235 @@
+import re
+import time
+import redis
+import logging
+import difflib
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy.orm import Session
+from app.core.config import settings, SOURCE_MAPPING
+from app.core.iso_codes import COUNTRIES, LANGUAGES
+from app.models.message import NormalizationAlias
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("source", "geo", "language", "funnel")
+
+# Aliases partners use that are not part of the ISO tables
+EXTRA_GEO_ALIASES = {
+    "UK": "GB",
+    "England": "GB",
+    "Great Britain": "GB",
+    "Russia": "RU",
+    "USA": "US",
+    "America": "US",
+    "UAE": "AE",
+    "Korea": "KR",
+    "Czech Republic": "CZ",
+    "Holland": "NL",
+}
+EXTRA_LANGUAGE_ALIASES = {
+    "UA": "UK",  # Ukrainian is often written with the country code
+    "JP": "JA",
+    "GR": "EL",
+    "CZ": "CS",
+    "DK": "DA",
+    "SE": "SV",
+    "Deutsch": "DE",
+    "Español": "ES",
+    "Espanol": "ES",
+    "Français": "FR",
+    "Francais": "FR",
+    "Italiano": "IT",
+    "Português": "PT",
+    "Portugues": "PT",
+}
+
+# Fuzzy matching below this length mostly produces false positives (codes)
+MIN_FUZZY_LENGTH = 4
+FUZZY_CUTOFF = 0.8
+
+NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def fold(value: str) -> str:
+    """Lookup key: lowercase with punctuation and whitespace removed"""
+    return NON_ALNUM.sub("", value.lower())
+
+
+class NormalizationTables:
+    """Immutable reverse-lookup tables (folded alias -> canonical) for one reload"""
+
+    def __init__(self, aliases: Dict[str, Dict[str, str]]):
+        self.lookup = {kind: {} for kind in KINDS}
+        for kind, mapping in aliases.items():
+            for alias, canonical in mapping.items():
+                key = fold(alias)
+                if key:
+                    self.lookup[kind][key] = canonical
+        self.keys = {kind: list(table) for kind, table in self.lookup.items()}
+        self.fuzzy = lru_cache(maxsize=4096)(self._fuzzy)
+
+    def _fuzzy(self, kind: str, key: str) -> Optional[str]:
+        if len(key) < MIN_FUZZY_LENGTH:
+            return None
+        matches = difflib.get_close_matches(key, self.keys[kind], n=1, cutoff=FUZZY_CUTOFF)
+        return matches[0] if matches else None
+
+    def resolve(self, kind: str, value: str):
+        """Return (found, canonical) for a raw value"""
+        key = fold(value)
+        table = self.lookup[kind]
+        if key in table:
+            return True, table[key]
+        match = self.fuzzy(kind, key)
+        if match is not None:
+            return True, table[match]
+        return False, None
+
+
+def builtin_aliases() -> Dict[str, Dict[str, str]]:
+    """Aliases known without the database"""
+    aliases = {kind: {} for kind in KINDS}
+
+    for standard, variants in SOURCE_MAPPING.items():
+        aliases["source"][standard] = standard
+        for variant in variants:
+            aliases["source"][variant] = standard
+
+    for alpha_2, alpha_3, name in COUNTRIES:
+        aliases["geo"][alpha_2] = alpha_2
+        aliases["geo"][alpha_3] = alpha_2
+        aliases["geo"][name] = alpha_2
+    aliases["geo"].update(EXTRA_GEO_ALIASES)
+
+    for code, name in LANGUAGES:
+        aliases["language"][code] = code
+        aliases["language"][name] = code
+    aliases["language"].update(EXTRA_LANGUAGE_ALIASES)
+
+    return aliases
+
+
+class NormalizationService:
+    """Normalizes sources, geos (ISO-3166 alpha-2), language codes and funnels.
+
+    Lookups go through precomputed folded-alias tables with a memoized fuzzy
+    fallback. Aliases stored in `normalization_aliases` are merged on top of
+    the built-in tables; bumping the Redis generation makes every process
+    rebuild its tables on the next `maybe_reload` without a restart.
+    """
+
+    def __init__(self, redis_client=None):
+        self.redis = redis_client or redis.from_url(settings.REDIS_URL)
+        self.generation_key = "normalization:generation"
+        self.tables = NormalizationTables(builtin_aliases())
+        self._generation = None
+        self._checked_at = 0.0
+
+    def reload(self, db: Session) -> int:
+        """Rebuild the lookup tables from built-ins plus database aliases"""
+        aliases = builtin_aliases()
+        rows = db.query(NormalizationAlias).all()
+        for row in rows:
+            if row.kind in aliases:
+                aliases[row.kind][row.alias] = row.canonical
+        # Canonical funnel names are their own aliases so fuzzy matches land on them
+        for canonical in {row.canonical for row in rows if row.kind == "funnel" and row.canonical}:
+            aliases["funnel"].setdefault(canonical, canonical)
+        self.tables = NormalizationTables(aliases)
+        logger.info("Loaded normalization tables with %s database aliases", len(rows))
+        return len(rows)
+
+    def maybe_reload(self, db: Session) -> bool:
+        """Reload if another process bumped the generation (checked at most every interval)"""
+        now = time.monotonic()
+        if self._generation is not None and now - self._checked_at < settings.NORMALIZATION_RELOAD_INTERVAL:
+            return False
+        self._checked_at = now
+        try:
+            generation = int(self.redis.get(self.generation_key) or 0)
+        except Exception as e:
+            logger.warning("Normalization generation unavailable: %s", e)
+            return False
+        if generation == self._generation:
+            return False
+        self.reload(db)
+        self._generation = generation
+        return True
+
+    def publish_reload(self) -> bool:
+        """Ask every process to reload its tables"""
+        try:
+            self.redis.incr(self.generation_key)
+            return True
+        except Exception as e:
+            logger.error("Failed to publish normalization reload: %s", e)
+            return False
+
+    def add_alias(self, db: Session, kind: str, alias: str, canonical: str) -> NormalizationAlias:
+        """Create or update an alias and broadcast the reload"""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown normalization kind: {kind}")
+        row = db.query(NormalizationAlias).filter_by(kind=kind, alias=alias).first()
+        if row:
+            row.canonical = canonical
+        else:
+            row = NormalizationAlias(kind=kind, alias=alias, canonical=canonical)
+            db.add(row)
+        db.commit()
+        self.reload(db)
+        self.publish_reload()
+        return row
+
+    def normalize_source(self, source: str) -> str:
+        found, canonical = self.tables.resolve("source", source)
+        return canonical if found else source.strip().upper()
+
+    def normalize_geo(self, geo: str) -> Optional[str]:
+        """ISO alpha-2 code, or None when the value does not resolve (e.g. "LATAM")"""
+        found, canonical = self.tables.resolve("geo", geo)
+        return canonical if found else None
+
+    def normalize_language(self, language: str) -> Optional[str]:
+        """ISO 639-1 code, or None when the value does not resolve"""
+        # Locale tags such as en-US / pt_BR reduce to the language part
+        base = re.split(r"[-_]", language.strip())[0]
+        found, canonical = self.tables.resolve("language", base)
+        return canonical if found else None
+
+    def normalize_funnel(self, funnel: str) -> str:
+        found, canonical = self.tables.resolve("funnel", funnel)
+        return canonical if found else " ".join(funnel.split())
+
+    def _normalize_list(self, values: Iterable[str], normalize) -> List[str]:
+        """Normalize and de-duplicate, keeping first-seen order"""
+        result = []
+        for value in values:
+            if not isinstance(value, str) or not value.strip():
+                continue
+            normalized = normalize(value)
+            if normalized and normalized not in result:
+                result.append(normalized)
+        return result
+
+    def normalize_deal(self, deal: Dict) -> Dict:
+        """Normalize one parsed deal in place.
+
+        Unresolved geos and languages are cleared and reported in
+        `validation_errors` rather than stored as free text.
+        """
+        for field, normalize in (("geo", self.normalize_geo), ("language_code", self.normalize_language)):
+            value = deal.get(field)
+            if isinstance(value, str):
+                deal[field] = normalize(value)
+                if deal[field] is None:
+                    deal.setdefault("validation_errors", []).append(f"Unrecognized {field}: {value}")
+        if isinstance(deal.get("sources"), list):
+            deal["sources"] = self._normalize_list(deal["sources"], self.normalize_source)
+        if isinstance(deal.get("funnels"), list):
+            deal["funnels"] = self._normalize_list(deal["funnels"], self.normalize_funnel)
+        return deal
+
+    def normalize_deals(self, deals: List[Dict]) -> List[Dict]:
+        """Normalize a batch of parsed deals; repeated values hit the memoized lookups"""
+        return [self.normalize_deal(deal) for deal in deals]
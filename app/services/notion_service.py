@@ -1,14 +1,40 @@
 from notion_client import Client
 import logging
+import re
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Deal fields that map directly onto a single Notion property
+NUMBER_PROPERTIES = {
+    "cpa_amount": "CPA_Amount",
+    "crg_percentage": "CRG_Percentage",
+    "cpl_amount": "CPL_Amount",
+}
+TEXT_PROPERTIES = {
+    "conversion_rate": "Conversion_Rate",
+    "geo": "Geo",
+}
+
+PAGE_ID_PATTERN = re.compile(r"([0-9a-f]{32})(?:[?#].*)?$")
+
+
+def page_id_from_url(url: str) -> Optional[str]:
+    """Extract the page id (dashed UUID) from a Notion page URL"""
+    match = PAGE_ID_PATTERN.search(url or "")
+    if not match:
+        return None
+    raw = match.group(1)
+    return f"{raw[:8]}-{raw[8:12]}-{raw[12:16]}-{raw[16:20]}-{raw[20:]}"
+
 class NotionService:
     def __init__(self):
-        self.client = Client(auth=settings.NOTION_API_KEY)
+        options = {"auth": settings.NOTION_API_KEY}
+        if settings.NOTION_BASE_URL:
+            options["base_url"] = settings.NOTION_BASE_URL
+        self.client = Client(**options)
         self.database_id = settings.NOTION_DATABASE_ID
         self.required_schema = {
             "Partner": "select",
@@ -59,23 +85,23 @@ class NotionService:
             }
             
         except Exception as e:
-            logger.error(f"Failed to verify database schema: {str(e)}")
+            logger.error("Failed to verify database schema: %s", e)
             return {"error": str(e)}
 
-    async def create_deal_page(self, deal_data: Dict) -> Optional[str]:
-        """Create a new deal page in Notion with enhanced validation"""
+    async def create_deal_page(self, deal_data: Dict) -> Optional[Dict]:
+        """Create a new deal page in Notion with enhanced validation; returns its id and url"""
         try:
             # Validate deal data
             validation_result = self._validate_deal_data(deal_data)
             if not validation_result["valid"]:
-                logger.error(f"Deal validation failed: {validation_result['errors']}")
+                logger.error("Deal validation failed: %s", validation_result['errors'])
                 return None
 
             # Prepare properties with new fields
             properties = {
                 "Partner": {"select": {"name": deal_data.get("partner_name", "Unknown")}},
                 "Geo": {"rich_text": [{"text": {"content": deal_data.get("geo", "")}}]},
-                "Language": {"select": {"name": deal_data.get("language_code", "EN")}},
+                "Language": {"select": {"name": deal_data.get("language_code") or "EN"}},
                 "Price_Model": {"select": {"name": deal_data.get("pricing_model", "CPA")}},
                 "CPA_Amount": {"number": float(deal_data.get("cpa_amount", 0)) if deal_data.get("cpa_amount") else None},
                 "CRG_Percentage": {"number": float(deal_data.get("crg_percentage", 0)) if deal_data.get("crg_percentage") else None},
@@ -94,13 +120,34 @@ class NotionService:
                 properties=properties
             )
             
-            logger.info(f"Created new deal page: {page.url}")
-            return page.url
+            logger.info("Created new deal page: %s", page['url'])
+            return {"id": page["id"], "url": page["url"]}
 
         except Exception as e:
-            logger.error(f"Failed to create Notion page: {str(e)}")
+            logger.error("Failed to create Notion page: %s", e)
             return None
 
+    async def update_deal_fields(self, page_id: str, changes: Dict, raw_text: Optional[str] = None) -> bool:
+        """Update only the changed deal fields on an existing page"""
+        try:
+            properties = {}
+            for field, value in changes.items():
+                if field in NUMBER_PROPERTIES:
+                    properties[NUMBER_PROPERTIES[field]] = {"number": float(value) if value is not None else None}
+                elif field in TEXT_PROPERTIES:
+                    properties[TEXT_PROPERTIES[field]] = {"rich_text": [{"text": {"content": value or ""}}]}
+            if raw_text is not None:
+                properties["Original_Message"] = {"rich_text": [{"text": {"content": raw_text}}]}
+            if not properties:
+                return True
+
+            self.client.pages.update(page_id=page_id, properties=properties)
+            logger.info("Updated %s on page %s", ', '.join(properties), page_id)
+            return True
+        except Exception as e:
+            logger.error("Failed to update deal page: %s", e)
+            return False
+
     async def update_deal_status(self, page_id: str, status: str) -> bool:
         """Update deal status in Notion"""
         try:
@@ -111,10 +158,22 @@ class NotionService:
                     "Last_Updated": {"date": {"start": datetime.now().isoformat()}}
                 }
             )
-            logger.info(f"Updated deal status to {status} for page {page_id}")
+            logger.info("Updated deal status to %s for page %s", status, page_id)
+            return True
+        except Exception as e:
+            logger.error("Failed to update deal status: %s", e)
+            return False
+
+    async def update_active_status(self, page_id: str, status: str) -> bool:
+        """Set a deal's Active_Status (Active, Inactive, Expired)"""
+        try:
+            self.client.pages.update(
+                page_id=page_id,
+                properties={"Active_Status": {"select": {"name": status}}}
+            )
             return True
         except Exception as e:
-            logger.error(f"Failed to update deal status: {str(e)}")
+            logger.error("Failed to update active status for page %s: %s", page_id, e)
             return False
 
     async def get_active_deals(self, geo: Optional[str] = None) -> List[Dict]:
@@ -138,7 +197,7 @@ class NotionService:
             return [self._format_deal_response(page) for page in response.results]
             
         except Exception as e:
-            logger.error(f"Failed to fetch active deals: {str(e)}")
+            logger.error("Failed to fetch active deals: %s", e)
             return []
 
     def _validate_deal_data(self, deal_data: Dict) -> Dict:
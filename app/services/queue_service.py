@@ -1,7 +1,8 @@
 import redis
 import json
 import logging
-from typing import Optional, Dict
+import time
+from typing import Optional, Dict, List
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -10,30 +11,48 @@ class QueueService:
     def __init__(self):
         self.redis = redis.from_url(settings.REDIS_URL)
         self.queue_key = "deal_processing_queue"
+        self.backfill_queue_key = "deal_processing_queue:backfill"  # low priority
         self.processing_set = "processing_messages"
         self.dead_letter_queue = "dead_letter_queue"
 
     async def enqueue_message(self, message_data: Dict) -> bool:
         """Add a message to the processing queue"""
         try:
+            message_data.setdefault('enqueued_at', time.time())
             self.redis.lpush(self.queue_key, json.dumps(message_data))
             return True
         except Exception as e:
-            logger.error(f"Failed to enqueue message: {str(e)}")
+            logger.error("Failed to enqueue message: %s", e)
+            return False
+
+    async def enqueue_batch(self, messages: List[Dict], low_priority: bool = True) -> bool:
+        """Add many messages in one pipelined round trip (backfill tier by default)"""
+        try:
+            key = self.backfill_queue_key if low_priority else self.queue_key
+            now = time.time()
+            pipe = self.redis.pipeline(transaction=False)
+            for message_data in messages:
+                message_data.setdefault('enqueued_at', now)
+                pipe.lpush(key, json.dumps(message_data))
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.error("Failed to enqueue batch of %s messages: %s", len(messages), e)
             return False
 
     async def dequeue_message(self) -> Optional[Dict]:
-        """Get next message from queue"""
+        """Get next message from queue; live messages always go before backfill"""
         try:
-            message = self.redis.rpop(self.queue_key)
+            message = self.redis.rpop(self.queue_key) or self.redis.rpop(self.backfill_queue_key)
             if message:
                 message_data = json.loads(message)
+                message_data['dequeued_at'] = time.time()
                 # Mark as processing
                 self.redis.sadd(self.processing_set, message_data['telegram_message_id'])
                 return message_data
             return None
         except Exception as e:
-            logger.error(f"Failed to dequeue message: {str(e)}")
+            logger.error("Failed to dequeue message: %s", e)
             return None
 
     async def mark_completed(self, telegram_message_id: str) -> bool:
@@ -42,7 +61,7 @@ class QueueService:
             self.redis.srem(self.processing_set, telegram_message_id)
             return True
         except Exception as e:
-            logger.error(f"Failed to mark message as completed: {str(e)}")
+            logger.error("Failed to mark message as completed: %s", e)
             return False
 
     async def move_to_dead_letter(self, message_data: Dict, error: str) -> bool:
@@ -53,17 +72,22 @@ class QueueService:
             self.redis.srem(self.processing_set, message_data['telegram_message_id'])
             return True
         except Exception as e:
-            logger.error(f"Failed to move message to dead letter queue: {str(e)}")
+            logger.error("Failed to move message to dead letter queue: %s", e)
             return False
 
+    async def get_backfill_size(self) -> int:
+        """Number of backfill messages still waiting"""
+        return self.redis.llen(self.backfill_queue_key)
+
     async def get_queue_size(self) -> Dict[str, int]:
         """Get current queue sizes"""
         try:
             return {
                 'main_queue': self.redis.llen(self.queue_key),
+                'backfill_queue': self.redis.llen(self.backfill_queue_key),
                 'processing': self.redis.scard(self.processing_set),
                 'dead_letter': self.redis.llen(self.dead_letter_queue)
             }
         except Exception as e:
-            logger.error(f"Failed to get queue sizes: {str(e)}")
+            logger.error("Failed to get queue sizes: %s", e)
             return {'error': str(e)}
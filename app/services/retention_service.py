@@ -0,0 +1,166 @@
+import os
+import re
+import gzip
+import logging
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import text
+from app.core.config import settings
+from app.db.base import get_engine
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "message_processing"
+DEFAULT_PARTITION = "message_processing_default"
+PARTITION_PATTERN = re.compile(r"^message_processing_y(\d{4})m(\d{2})$")
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year}m{month.month:02d}"
+
+
+class RetentionService:
+    """Maintains monthly message_processing partitions.
+
+    Creates partitions ahead of time so inserts rarely land in the default
+    partition, moves rows that did land there into their monthly partition,
+    and archives partitions older than the retention window to gzipped CSV
+    before detaching and dropping them.
+    """
+
+    def __init__(
+        self,
+        retention_months: Optional[int] = None,
+        months_ahead: Optional[int] = None,
+        archive_dir: Optional[str] = None
+    ):
+        self.retention_months = retention_months or settings.MESSAGE_RETENTION_MONTHS
+        self.months_ahead = months_ahead or settings.PARTITION_MONTHS_AHEAD
+        self.archive_dir = archive_dir or settings.ARCHIVE_DIR
+
+    def list_partitions(self) -> List[Tuple[str, date]]:
+        """Monthly partitions of message_processing, oldest first"""
+        with get_engine().connect() as conn:
+            rows = conn.execute(text("""
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class parent ON pg_inherits.inhparent = parent.oid
+                JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+                WHERE parent.relname = :parent
+            """), {"parent": PARENT_TABLE}).fetchall()
+
+        partitions = []
+        for (name,) in rows:
+            match = PARTITION_PATTERN.match(name)
+            if match:
+                partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+        return sorted(partitions, key=lambda partition: partition[1])
+
+    def _default_months(self, conn) -> List[date]:
+        """Months that currently have rows in the default partition"""
+        if not conn.execute(text("SELECT to_regclass(:name)"), {"name": DEFAULT_PARTITION}).scalar():
+            return []
+        rows = conn.execute(text(
+            f"SELECT DISTINCT date_trunc('month', created_at)::date FROM {DEFAULT_PARTITION}"
+        )).fetchall()
+        return [row[0] for row in rows]
+
+    def _create_partition(self, conn, month: date, move_rows: bool):
+        """Create one monthly partition, moving matching rows out of the default.
+
+        Postgres refuses to create a partition whose range already has rows in
+        the default partition, so the default is detached while they move.
+        """
+        name = partition_name(month)
+        lower, upper = month.isoformat(), add_months(month, 1).isoformat()
+        if move_rows:
+            conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+        conn.execute(text(
+            f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} FOR VALUES FROM ('{lower}') TO ('{upper}')"
+        ))
+        if move_rows:
+            conn.execute(text(f"""
+                WITH moved AS (
+                    DELETE FROM {DEFAULT_PARTITION}
+                    WHERE created_at >= '{lower}' AND created_at < '{upper}'
+                    RETURNING *
+                )
+                INSERT INTO {name} SELECT * FROM moved
+            """))
+            conn.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+
+    def ensure_partitions(self, today: Optional[date] = None) -> List[str]:
+        """Create missing partitions through months_ahead, plus any month stuck in the default"""
+        today = today or date.today()
+        existing = {name for name, _ in self.list_partitions()}
+        current = date(today.year, today.month, 1)
+        created = []
+        with get_engine().begin() as conn:
+            in_default = set(self._default_months(conn))
+            months = in_default | {add_months(current, offset) for offset in range(self.months_ahead + 1)}
+            for month in sorted(months):
+                name = partition_name(month)
+                if name in existing:
+                    continue
+                self._create_partition(conn, month, move_rows=month in in_default)
+                created.append(name)
+        for name in created:
+            logger.info("Created partition %s", name)
+        return created
+
+    def archive_partition(self, name: str) -> str:
+        """Stream a partition to a gzipped CSV file and return its path"""
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(self.archive_dir, f"{name}.csv.gz")
+        tmp_path = f"{path}.tmp"
+
+        raw = get_engine().raw_connection()
+        try:
+            with gzip.open(tmp_path, "wb") as archive:
+                cursor = raw.cursor()
+                cursor.copy_expert(f"COPY (SELECT * FROM {name} ORDER BY id) TO STDOUT WITH CSV HEADER", archive)
+                cursor.close()
+                archive.flush()
+                os.fsync(archive.fileobj.fileno())
+            raw.rollback()
+        finally:
+            raw.close()
+
+        os.replace(tmp_path, path)
+        return path
+
+    def drop_partition(self, name: str):
+        """Detach and drop a partition (archive it first)"""
+        with get_engine().begin() as conn:
+            conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+            conn.execute(text(f"DROP TABLE {name}"))
+        logger.info("Dropped partition %s", name)
+
+    def expire_partitions(self, today: Optional[date] = None) -> List[Dict]:
+        """Archive and drop partitions that ended before the retention window"""
+        today = today or date.today()
+        cutoff = add_months(date(today.year, today.month, 1), -self.retention_months)
+        expired = []
+        for name, month in self.list_partitions():
+            if add_months(month, 1) > cutoff:
+                break
+            path = self.archive_partition(name)
+            self.drop_partition(name)
+            expired.append({"partition": name, "archive": path, "size_bytes": os.path.getsize(path)})
+        return expired
+
+    def run(self) -> Dict:
+        """Single retention pass: create upcoming partitions, expire old ones"""
+        started = datetime.utcnow()
+        created = self.ensure_partitions()
+        expired = self.expire_partitions()
+        return {
+            "created": created,
+            "expired": expired,
+            "seconds": round((datetime.utcnow() - started).total_seconds(), 2)
+        }
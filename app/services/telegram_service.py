@@ -0,0 +1,149 @@
+import aiohttp
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+from app.core.config import settings, RATE_LIMITS
+from app.core.rate_limit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Telegram rejects message text longer than this
+MAX_MESSAGE_LENGTH = 4096
+
+
+def addressed_to_bot(message: Dict) -> bool:
+    """True for private chats, replies to the bot and messages that mention it"""
+    if message.get("chat", {}).get("type") == "private":
+        return True
+    bot_id = settings.TELEGRAM_BOT_TOKEN.split(":", 1)[0]
+    replied_to = (message.get("reply_to_message") or {}).get("from", {})
+    if str(replied_to.get("id")) == bot_id:
+        return True
+    username = settings.TELEGRAM_BOT_USERNAME
+    return bool(username) and f"@{username.lower()}" in message.get("text", "").lower()
+
+
+class TelegramService:
+    def __init__(self):
+        self.base_url = f"{settings.TELEGRAM_API_URL}/bot{settings.TELEGRAM_BOT_TOKEN}"
+        self.limiter = RateLimiter(RATE_LIMITS['telegram']['messages_per_second'])
+        self._session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+        return self._session
+
+    async def _call(self, method: str, payload: Dict) -> Optional[Dict]:
+        """Call a Bot API method, honouring the global rate limit and 429 retry_after"""
+        for _ in range(2):
+            await self.limiter.acquire()
+            session = await self._get_session()
+            async with session.post(f"{self.base_url}/{method}", json=payload) as response:
+                body = await response.json()
+            if body.get("ok"):
+                return body["result"]
+            if response.status == 429:
+                retry_after = body.get("parameters", {}).get("retry_after", RATE_LIMITS['telegram']['retry_after'])
+                logger.warning("Telegram rate limited on %s, retrying after %ss", method, retry_after)
+                self.limiter.backoff(retry_after)
+                continue
+            logger.error("Telegram %s failed: %s", method, body.get('description'))
+            return None
+        return None
+
+    async def send_message(self, chat_id: int, text: str) -> Optional[int]:
+        """Send a message and return its message_id"""
+        try:
+            result = await self._call("sendMessage", {"chat_id": chat_id, "text": text[:MAX_MESSAGE_LENGTH]})
+            return result["message_id"] if result else None
+        except Exception as e:
+            logger.error("Failed to send Telegram message: %s", e)
+            return None
+
+    async def edit_message_text(self, chat_id: int, message_id: int, text: str) -> bool:
+        """Replace the text of a previously sent message"""
+        try:
+            result = await self._call("editMessageText", {
+                "chat_id": chat_id,
+                "message_id": message_id,
+                "text": text[:MAX_MESSAGE_LENGTH]
+            })
+            return result is not None
+        except Exception as e:
+            logger.error("Failed to edit Telegram message: %s", e)
+            return False
+
+    async def set_webhook(self, url: str) -> bool:
+        """Point the bot's webhook at `url`"""
+        try:
+            return await self._call("setWebhook", {"url": url}) is not None
+        except Exception as e:
+            logger.error("Failed to set Telegram webhook: %s", e)
+            return False
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+
+class StreamingReply:
+    """Renders streamed text into a single Telegram message via throttled edits.
+
+    The first chunk is sent immediately so the user sees output as soon as the
+    model produces it; after that the message is edited at most once every
+    `edit_interval` seconds, and a final edit flushes whatever is left.
+    """
+
+    def __init__(self, telegram: TelegramService, chat_id: int, edit_interval: Optional[float] = None):
+        self.telegram = telegram
+        self.chat_id = chat_id
+        self.edit_interval = edit_interval if edit_interval is not None else settings.STREAM_EDIT_INTERVAL
+        self.text = ""
+        self.message_id = None
+        self._started = False
+        self._sent_text = ""
+        self._last_update = 0.0
+        self._pending = None
+
+    async def push(self, delta: str):
+        """Append streamed text, updating the chat if the throttle allows"""
+        self.text += delta
+        if not self.text.strip():
+            return
+        if not self._started:
+            await self._send_first()
+        elif self._pending is None and time.monotonic() - self._last_update >= self.edit_interval:
+            # Edit in the background so a slow Telegram call never stalls the model stream
+            self._pending = asyncio.create_task(self._flush())
+
+    async def _send_first(self):
+        self._started = True
+        self._sent_text = self.text[:MAX_MESSAGE_LENGTH]
+        self._last_update = time.monotonic()
+        self.message_id = await self.telegram.send_message(self.chat_id, self._sent_text)
+
+    async def _flush(self):
+        try:
+            text = self.text[:MAX_MESSAGE_LENGTH]
+            if self.message_id is not None and text != self._sent_text:
+                self._last_update = time.monotonic()
+                if await self.telegram.edit_message_text(self.chat_id, self.message_id, text):
+                    self._sent_text = text
+        finally:
+            self._pending = None
+
+    async def finish(self) -> str:
+        """Flush the final text, sending any overflow as follow-up messages"""
+        if self._pending:
+            await self._pending
+        if not self._started:
+            if self.text.strip():
+                await self._send_first()
+        else:
+            await self._flush()
+
+        for start in range(MAX_MESSAGE_LENGTH, len(self.text), MAX_MESSAGE_LENGTH):
+            await self.telegram.send_message(self.chat_id, self.text[start:start + MAX_MESSAGE_LENGTH])
+        return self.text
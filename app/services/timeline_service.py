@@ -0,0 +1,170 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from sqlalchemy import Integer, func
+from sqlalchemy.orm import Session
+from app.models.message import MessageProcessing
+
+logger = logging.getLogger(__name__)
+
+# Stages recorded for every message, in pipeline order
+STAGES = [
+    "received",
+    "enqueued",
+    "dequeued",
+    "parse_start",
+    "parse_end",
+    "notion_start",
+    "notion_end",
+    "reply_start",  # chat messages answered instead of parsed
+    "reply_end",
+    "committed"
+]
+
+# Named spans reported in percentile breakdowns: span -> (start stage, end stage)
+STAGE_SPANS = {
+    "ingest": ("received", "enqueued"),
+    "queue_wait": ("enqueued", "dequeued"),
+    "parse": ("parse_start", "parse_end"),
+    "notion": ("notion_start", "notion_end"),
+    "reply": ("reply_start", "reply_end"),
+    "commit": ("notion_end", "committed")
+}
+
+PERCENTILES = [0.5, 0.95, 0.99]
+
+
+def _to_epoch(value: datetime) -> float:
+    """Convert a naive UTC datetime to epoch seconds"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class MessageTimeline:
+    """Per-message stage timestamps stored as millisecond offsets from ingest"""
+
+    def __init__(self, origin: datetime, stages: Optional[Dict[str, int]] = None):
+        self.origin = _to_epoch(origin)
+        self.stages = dict(stages or {})
+
+    @classmethod
+    def for_message(cls, message: MessageProcessing) -> "MessageTimeline":
+        """Load the timeline already stored on a message row"""
+        return cls(message.created_at or datetime.utcnow(), message.timeline)
+
+    def mark(self, stage: str, at: Optional[float] = None) -> int:
+        """Record a stage at epoch seconds `at` (defaults to now)"""
+        if stage not in STAGES:
+            raise ValueError(f"Unknown timeline stage: {stage}")
+        if at is None:
+            at = _to_epoch(datetime.utcnow())
+        offset = int(round((at - self.origin) * 1000))
+        self.stages[stage] = max(offset, 0)
+        return self.stages[stage]
+
+    def span(self, name: str) -> Optional[int]:
+        """Duration of a named span in milliseconds, if both ends were recorded"""
+        start, end = STAGE_SPANS[name]
+        if start in self.stages and end in self.stages:
+            return self.stages[end] - self.stages[start]
+        return None
+
+    @property
+    def total_ms(self) -> Optional[int]:
+        return self.stages.get("committed")
+
+    def to_dict(self) -> Dict[str, int]:
+        """Compact representation persisted in `message_processing.timeline`"""
+        return {stage: self.stages[stage] for stage in STAGES if stage in self.stages}
+
+
+class TimelineService:
+    """Queries over persisted message timelines for tail-latency analysis"""
+
+    def _window(self, since: Optional[datetime], until: Optional[datetime]):
+        until = until or datetime.utcnow()
+        since = since or until - timedelta(hours=24)
+        return since, until
+
+    def _span_expression(self, name: str):
+        start, end = STAGE_SPANS[name]
+        timeline = MessageProcessing.timeline
+        return timeline[end].astext.cast(Integer) - timeline[start].astext.cast(Integer)
+
+    def get_slowest_messages(
+        self,
+        db: Session,
+        limit: int = 20,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> List[Dict]:
+        """Return the slowest N completed messages in the window"""
+        since, until = self._window(since, until)
+        messages = (
+            db.query(MessageProcessing)
+            .filter(
+                MessageProcessing.created_at >= since,
+                MessageProcessing.created_at < until,
+                MessageProcessing.total_ms.isnot(None)
+            )
+            .order_by(MessageProcessing.total_ms.desc())
+            .limit(limit)
+            .all()
+        )
+
+        results = []
+        for message in messages:
+            timeline = MessageTimeline.for_message(message)
+            results.append({
+                "id": message.id,
+                "correlation_id": message.correlation_id,
+                "telegram_message_id": message.telegram_message_id,
+                "status": message.status,
+                "attempts": message.attempts,
+                "total_ms": message.total_ms,
+                "timeline": timeline.to_dict(),
+                "spans": {name: timeline.span(name) for name in STAGE_SPANS},
+                "attempt_durations": message.attempt_durations or [],
+                "created_at": message.created_at.isoformat() if message.created_at else None
+            })
+        return results
+
+    def get_latency_percentiles(
+        self,
+        db: Session,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Dict:
+        """Return end-to-end and per-span latency percentiles for the window"""
+        since, until = self._window(since, until)
+        expressions = {"total": MessageProcessing.total_ms}
+        expressions.update({name: self._span_expression(name) for name in STAGE_SPANS})
+
+        columns = [func.count(MessageProcessing.total_ms)]
+        for expression in expressions.values():
+            columns.extend(func.percentile_cont(p).within_group(expression) for p in PERCENTILES)
+
+        row = (
+            db.query(*columns)
+            .filter(
+                MessageProcessing.created_at >= since,
+                MessageProcessing.created_at < until
+            )
+            .one()
+        )
+
+        breakdown = {}
+        values = iter(row[1:])
+        for name in expressions:
+            breakdown[name] = {
+                f"p{int(p * 100)}": round(value, 1) if value is not None else None
+                for p, value in zip(PERCENTILES, values)
+            }
+
+        return {
+            "since": since.isoformat(),
+            "until": until.isoformat(),
+            "count": row[0],
+            "percentiles_ms": breakdown
+        }
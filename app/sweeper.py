@@ -0,0 +1,54 @@
+import asyncio
+import logging
+import signal
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.db.base import SessionLocal
+from app.services.expiration_service import ExpirationSweeper
+
+logger = logging.getLogger(__name__)
+
+class SweeperWorker:
+    def __init__(self):
+        self.sweeper = ExpirationSweeper()
+        self.should_exit = False
+
+    async def shutdown(self, sig):
+        print(f"\nReceived exit signal {sig.name}...")
+        self.should_exit = True
+
+    async def run(self):
+        """Run an expiration sweep every EXPIRATION_SWEEP_INTERVAL seconds"""
+        logger.info("Starting expiration sweeper...")
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(
+                sig,
+                lambda s=sig: asyncio.create_task(self.shutdown(s))
+            )
+
+        while not self.should_exit:
+            db = SessionLocal()
+            try:
+                result = await self.sweeper.sweep(db)
+                if result["expired"] or result["failed"]:
+                    logger.info("Expiration sweep: %s", result)
+            except Exception as e:
+                logger.error("Expiration sweep failed: %s", e)
+                db.rollback()
+            finally:
+                db.close()
+
+            # Sleep in short steps so shutdown stays responsive
+            for _ in range(settings.EXPIRATION_SWEEP_INTERVAL):
+                if self.should_exit:
+                    break
+                await asyncio.sleep(1)
+
+        print("Shutdown complete.")
+
+if __name__ == "__main__":
+    setup_logging()
+    sweeper = SweeperWorker()
+    asyncio.run(sweeper.run())
@@ -1,78 +1,240 @@
 import asyncio
 import logging
+from functools import cached_property
 from sqlalchemy.orm import Session
-from app.db.base import SessionLocal
+from app.db.base import SessionLocal, get_engine
+from app.core.logging import correlation_id_var, setup_logging
+from app.core.startup import StartupTimer, warm_database, warm_redis
 from app.services.queue_service import QueueService
-from app.services.claude_service import ClaudeService
-from app.services.notion_service import NotionService
+from app.services.claude_service import ClaudeService, is_deal_post
+from app.services.notion_service import NotionService, page_id_from_url
+from app.services.dedup_service import DedupService
+from app.services.deal_query_service import DealQueryService
+from app.services.timeline_service import MessageTimeline
 from app.models.message import MessageProcessing, ParsedDeal
 from datetime import datetime
 import signal
+import time
 
 logger = logging.getLogger(__name__)
 
 class DealWorker:
     def __init__(self):
-        self.queue_service = QueueService()
-        self.claude_service = ClaudeService()
-        self.notion_service = NotionService()
+        self.startup = StartupTimer()
         self.should_exit = False
+
+    # Clients are built on first use; run() builds them concurrently in warm_up()
+    @cached_property
+    def queue_service(self) -> QueueService:
+        return QueueService()
+
+    @cached_property
+    def claude_service(self) -> ClaudeService:
+        return ClaudeService()
+
+    @cached_property
+    def notion_service(self) -> NotionService:
+        return NotionService()
+
+    @cached_property
+    def deal_query_service(self) -> DealQueryService:
+        return DealQueryService(redis_client=self.queue_service.redis)
+
+    @cached_property
+    def dedup_service(self) -> DedupService:
+        return DedupService()
+
+    async def warm_up(self):
+        """Build clients and open DB, Redis and Notion connections before taking work.
+
+        The engine and the Redis client are shared between steps, so they are
+        created here first; each threaded step then only builds the client it
+        owns, and no cached_property is first read from two threads at once.
+        """
+        get_engine()
+        self.queue_service
+        await self.startup.warm_up(
+            database=warm_database,
+            redis=lambda: warm_redis(self.queue_service.redis),
+            claude=lambda: asyncio.to_thread(lambda: self.claude_service),
+            notion=lambda: asyncio.to_thread(lambda: self.notion_service.client.users.me()),
+            dedup=lambda: asyncio.to_thread(self._warm_dedup)
+        )
+        self.startup.mark_ready()
+
+    def _warm_dedup(self):
+        """Load the recent-deal SimHash index"""
+        db = SessionLocal()
+        try:
+            self.dedup_service.refresh(db)
+        finally:
+            db.close()
         
     async def shutdown(self, sig, loop):
         print(f"\nReceived exit signal {sig.name}...")
         self.should_exit = True
         
+    def _record_attempt(self, message: MessageProcessing, timeline: MessageTimeline, attempt_start: float):
+        """Persist the timeline and this attempt's duration on the message row"""
+        message.timeline = timeline.to_dict()
+        message.attempt_durations = (message.attempt_durations or []) + [
+            int(round((time.time() - attempt_start) * 1000))
+        ]
+
+    def _deal_columns(self, deal_data: dict) -> dict:
+        """Keep only the parsed fields that map onto ParsedDeal columns"""
+        reserved = {"id", "message_id", "notion_url", "notion_page_id", "active_status", "text_simhash", "created_at"}
+        columns = {column.name for column in ParsedDeal.__table__.columns} - reserved
+        return {key: value for key, value in deal_data.items() if key in columns}
+
+    async def _complete(
+        self,
+        message: MessageProcessing,
+        message_data: dict,
+        timeline: MessageTimeline,
+        attempt_start: float,
+        db: Session,
+        deal_changed: bool = True
+    ):
+        """Mark the message completed, commit and release it from the queue"""
+        message.status = "completed"
+        message.processed_at = datetime.utcnow()
+        message.total_ms = timeline.mark("committed")
+        self._record_attempt(message, timeline, attempt_start)
+        db.commit()
+        if deal_changed:
+            self.deal_query_service.invalidate_cache()
+
+        # Mark as completed in queue
+        await self.queue_service.mark_completed(message_data['telegram_message_id'])
+
+    async def _update_duplicate(self, message: MessageProcessing, text: str, timeline: MessageTimeline, db: Session) -> bool:
+        """Apply a near-duplicate repost to the existing deal and Notion page.
+
+        Returns False when the message is not a repost or its changes cannot
+        be mapped onto the prior parse, in which case it is parsed normally.
+        """
+        duplicate = self.dedup_service.find_duplicate(db, text)
+        if not duplicate:
+            return False
+        deal, distance = duplicate
+
+        previous_text = self.dedup_service.previous_text(db, deal)
+        page_id = deal.notion_page_id or page_id_from_url(deal.notion_url)
+        if previous_text is None or page_id is None:
+            return False
+        changes = self.dedup_service.diff(previous_text, text, deal)
+        if changes is None:
+            return False
+
+        if changes:
+            timeline.mark("notion_start")
+            if not await self.notion_service.update_deal_fields(page_id, changes, raw_text=text):
+                raise Exception("Failed to update Notion page")
+            timeline.mark("notion_end")
+
+        for field, value in changes.items():
+            setattr(deal, field, value)
+        deal.message_id = message.id
+        self.dedup_service.remember(deal, text)
+        logger.info("Message %s is a repost of deal %s (distance %s), updated %s", message.id, deal.id, distance, list(changes))
+        return True
+
+    async def _reply(self, message_data: dict, timeline: MessageTimeline):
+        """Answer a question or chat message in the chat it came from"""
+        timeline.mark("reply_start")
+        result = await self.claude_service.handle_message(
+            str(message_data.get('user_id') or message_data['chat_id']),
+            message_data['text'],
+            chat_id=message_data['chat_id']
+        )
+        timeline.mark("reply_end")
+        if result and result.get("error"):
+            raise Exception(result["error"])
+
     async def process_message(self, message_data: dict, db: Session):
         """Process a single message"""
+        message = None
+        timeline = None
+        attempt_start = time.time()
         try:
             # Update message status
             message = db.query(MessageProcessing).filter_by(id=message_data['db_id']).first()
             if not message:
-                logger.error(f"Message not found in database: {message_data['db_id']}")
+                logger.error("Message not found in database: %s", message_data['db_id'])
                 return False
+
+            self.claude_service.normalization_service.maybe_reload(db)
+
+            timeline = MessageTimeline.for_message(message)
+            if 'enqueued_at' in message_data:
+                timeline.mark("enqueued", message_data['enqueued_at'])
+            timeline.mark("dequeued", message_data.get('dequeued_at', attempt_start))
+            logger.debug("Processing message %s, attempt %s", message.id, message.attempts + 1)
                 
             message.status = "processing"
             message.attempts += 1
             db.commit()
+
+            # Questions and conversation get a reply instead of a Notion page, but
+            # only when addressed to the bot; other group chatter is left alone.
+            # Backfilled messages carry no chat and are always parsed as deals
+            if message_data.get('chat_id') is not None and not is_deal_post(message_data['text']):
+                if message_data.get('addressed'):
+                    await self._reply(message_data, timeline)
+                else:
+                    logger.debug("Ignoring group chatter in message %s", message.id)
+                await self._complete(message, message_data, timeline, attempt_start, db, deal_changed=False)
+                return True
+
+            # Reposts skip the LLM call and page creation entirely
+            if await self._update_duplicate(message, message_data['text'], timeline, db):
+                await self._complete(message, message_data, timeline, attempt_start, db)
+                return True
             
             # Parse deal using Claude
+            timeline.mark("parse_start")
             parsed_data = await self.claude_service.parse_deal(message_data['text'])
+            timeline.mark("parse_end")
             if not parsed_data:
                 raise Exception("Failed to parse deal data")
+            deal_data = parsed_data["data"]
                 
             # Create Notion page
-            notion_url = await self.notion_service.create_deal_page({
-                **parsed_data,
+            timeline.mark("notion_start")
+            notion_page = await self.notion_service.create_deal_page({
+                **deal_data,
                 "raw_text": message_data['text']
             })
+            timeline.mark("notion_end")
             
-            if not notion_url:
+            if not notion_page:
                 raise Exception("Failed to create Notion page")
                 
             # Save parsed deal to database
             deal = ParsedDeal(
                 message_id=message.id,
-                **parsed_data,
-                notion_url=notion_url
+                **self._deal_columns(deal_data),
+                notion_url=notion_page["url"],
+                notion_page_id=notion_page["id"],
+                active_status="Active"
             )
+            self.dedup_service.remember(deal, message_data['text'])
             db.add(deal)
             
-            # Update message status
-            message.status = "completed"
-            message.processed_at = datetime.utcnow()
-            db.commit()
-            
-            # Mark as completed in queue
-            await self.queue_service.mark_completed(message_data['telegram_message_id'])
-            
+            message.partner_name = deal_data.get("partner_name")
+            await self._complete(message, message_data, timeline, attempt_start, db)
             return True
             
         except Exception as e:
-            logger.error(f"Error processing message: {str(e)}")
+            logger.error("Error processing message %s: %s", message_data.get('db_id'), e)
             
             if message:
+                db.rollback()
                 message.status = "failed"
                 message.error_message = str(e)
+                if timeline:
+                    self._record_attempt(message, timeline, attempt_start)
                 db.commit()
                 
             # Move to dead letter queue if max retries reached
@@ -84,6 +246,7 @@ class DealWorker:
     async def run(self):
         """Main worker loop"""
         logger.info("Starting deal worker...")
+        await self.warm_up()
         
         # Setup signal handlers
         loop = asyncio.get_running_loop()
@@ -104,13 +267,15 @@ class DealWorker:
                     
                 # Process message
                 db = SessionLocal()
+                token = correlation_id_var.set(message.get('correlation_id'))
                 try:
                     await self.process_message(message, db)
                 finally:
+                    correlation_id_var.reset(token)
                     db.close()
                     
             except Exception as e:
-                logger.error(f"Worker error: {str(e)}")
+                logger.error("Worker error: %s", e)
                 await asyncio.sleep(1)
             except asyncio.CancelledError:
                 break
@@ -118,5 +283,6 @@ class DealWorker:
         print("Shutdown complete.")
 
 if __name__ == "__main__":
+    setup_logging()
     worker = DealWorker()
     asyncio.run(worker.run())
@@ -0,0 +1,130 @@
+"""Corpus of realistic partner deal messages for load testing.
+
+Messages are generated deterministically from a seed so two benchmark runs
+replay exactly the same traffic. `extract_deal` mirrors what Claude would
+return for a corpus message and is used by the fake Anthropic server.
+"""
+import random
+import re
+from typing import Dict, Iterator, List, Optional
+
+PARTNERS = ["AffNet", "LeadHub", "TrafficLab", "CPAKing", "NovaLeads", "GreenMedia"]
+GEOS = {
+    "DE": "DE", "FR": "FR", "IT": "IT", "ES": "ES", "UK": "EN", "NL": "NL",
+    "PL": "PL", "CA": "EN", "AU": "EN", "MX": "ES", "BR": "PT", "JP": "JA",
+}
+SOURCES = ["Facebook", "FB", "Google", "gg", "Native", "nativeads", "Bing", "SEO", "MSN", "TikTok"]
+FUNNELS = ["Bitcoin Era", "Immediate Edge", "Quantum AI", "Crypto Comeback", "Tesla X", "Oil Profit"]
+
+TEMPLATES = [
+    (
+        "{partner} deal\n"
+        "{geo} {lang}{native}\n"
+        "{model} {price}$ {crg}\n"
+        "Sources: {sources}\n"
+        "Funnels: {funnels}\n"
+        "CR: {cr}%"
+    ),
+    (
+        "NEW from {partner}!!\n"
+        "GEO: {geo} | Lang: {lang}{native}\n"
+        "Price: {model} {price}$ + {crg}\n"
+        "Traffic: {sources}\n"
+        "Offers: {funnels}\n"
+        "Conversion {cr}%, deduction up to 10%"
+    ),
+    (
+        "{geo} - {partner}\n"
+        "{model} {price}$ / {crg}\n"
+        "{sources} only\n"
+        "{funnels}\n"
+        "cr {cr}% lang {lang}{native}"
+    ),
+]
+
+GEO_PATTERN = re.compile(r"\b(" + "|".join(GEOS) + r")\b")
+MODEL_PATTERN = re.compile(r"\b(CPA|CPL)\s+(\d+)\$")
+CRG_PATTERN = re.compile(r"(\d+)% CRG")
+CR_PATTERN = re.compile(r"(?i)\bcr:?\s*(\d+(?:\.\d+)?)%|conversion\s+(\d+(?:\.\d+)?)%")
+LANG_PATTERN = re.compile(r"\b[Ll]ang:?\s+([A-Z]{2})\b|^[A-Z]{2}\s+([A-Z]{2})\b", re.MULTILINE)
+NATIVE_PATTERN = re.compile(r"\b[A-Z]{2} native\b")
+
+
+def generate_corpus(count: int, seed: int = 42) -> List[str]:
+    """Generate `count` deal messages"""
+    return list(iter_corpus(count, seed))
+
+
+def iter_corpus(count: int, seed: int = 42) -> Iterator[str]:
+    """Yield `count` deal messages, deterministic for a given seed"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        geo = rng.choice(list(GEOS))
+        model = rng.choice(["CPA", "CPA", "CPL"])
+        price = rng.choice(range(20, 60)) if model == "CPL" else rng.choice(range(500, 1500, 50))
+        yield rng.choice(TEMPLATES).format(
+            partner=rng.choice(PARTNERS),
+            geo=geo,
+            lang=GEOS[geo],
+            native=" native" if rng.random() < 0.3 else "",
+            model=model,
+            price=price,
+            crg=f"{rng.choice([5, 8, 10, 12, 15])}% CRG",
+            sources=", ".join(rng.sample(SOURCES, rng.randint(1, 3))),
+            funnels=", ".join(rng.sample(FUNNELS, rng.randint(1, 2))),
+            cr=rng.choice(["8", "10", "12.5", "15"])
+        )
+
+
+CHAT_MESSAGES = [
+    "hey, anything new for {geo} this week?",
+    "what do you think about {funnel} for {geo}?",
+    "show deals {geo} under {price}",
+    "active deals from {source}",
+    "can you remind me how CR is calculated?",
+    "thanks! what else is trending?",
+]
+
+
+def generate_chat(count: int, seed: int = 42) -> List[str]:
+    """Generate `count` private-chat messages: questions and deal queries"""
+    rng = random.Random(seed + 1)
+    return [
+        rng.choice(CHAT_MESSAGES).format(
+            geo=rng.choice(list(GEOS)),
+            funnel=rng.choice(FUNNELS),
+            source=rng.choice(SOURCES),
+            price=rng.choice(range(500, 1500, 100))
+        )
+        for _ in range(count)
+    ]
+
+
+def _first_group(match: Optional[re.Match]) -> Optional[str]:
+    if not match:
+        return None
+    return next((group for group in match.groups() if group), None)
+
+
+def extract_deal(text: str) -> Dict:
+    """Extract the deal fields Claude would return for a corpus message"""
+    model_match = MODEL_PATTERN.search(text)
+    model, price = (model_match.group(1), float(model_match.group(2))) if model_match else ("CPA", None)
+    crg = CRG_PATTERN.search(text)
+    geo = GEO_PATTERN.search(text)
+
+    deal = {
+        "partner_name": next((p for p in PARTNERS if p in text), "Unknown"),
+        "geo": geo.group(1) if geo else None,
+        "language_code": _first_group(LANG_PATTERN.search(text)) or "EN",
+        "is_native": bool(NATIVE_PATTERN.search(text)),
+        "pricing_model": model,
+        "cpa_amount": price if model == "CPA" else None,
+        "cpl_amount": price if model == "CPL" else None,
+        "crg_percentage": float(crg.group(1)) if crg else None,
+        "conversion_rate": _first_group(CR_PATTERN.search(text)),
+        "sources": [s for s in SOURCES if re.search(rf"\b{re.escape(s)}\b", text)],
+        "funnels": [f for f in FUNNELS if f in text],
+    }
+    # Claude omits fields it could not find rather than returning nulls
+    return {key: value for key, value in deal.items() if value is not None}
@@ -0,0 +1,355 @@
+"""Local stand-ins for the Anthropic, Notion and Telegram Bot HTTP APIs.
+
+Each fake runs an aiohttp server on its own event loop in a background
+thread, so the (synchronous) SDK clients used by the services can call it
+without deadlocking the caller's loop. Latency, error rate and 429
+behaviour are configurable per server, and every request is counted.
+"""
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Dict, Optional
+from aiohttp import web
+from benchmarks.corpus import extract_deal
+
+
+class FakeBehaviour:
+    """Latency and failure profile for a fake upstream"""
+
+    def __init__(
+        self,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0.0,
+        rate_limit_per_second: Optional[float] = None,
+        retry_after: int = 1,
+        seed: int = 0
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_per_second = rate_limit_per_second
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+
+    def delay(self) -> float:
+        """Seconds to wait before answering a request"""
+        jitter = self.rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        return max(self.latency_ms + jitter, 0) / 1000
+
+    def should_fail(self) -> bool:
+        return self.error_rate > 0 and self.rng.random() < self.error_rate
+
+
+class FakeServer(ABC):
+    """Base class: runs an aiohttp app in a background thread and counts calls"""
+
+    name = "fake"
+
+    def __init__(self, behaviour: Optional[FakeBehaviour] = None, host: str = "127.0.0.1", port: int = 0):
+        self.behaviour = behaviour or FakeBehaviour()
+        self.host = host
+        self.port = port
+        self.calls = Counter()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @abstractmethod
+    def routes(self, app: web.Application):
+        ...
+
+    def _rate_limited(self) -> bool:
+        """Fixed one-second window limiter mimicking upstream 429s"""
+        limit = self.behaviour.rate_limit_per_second
+        if not limit:
+            return False
+        now = time.monotonic()
+        if now - self._window_start >= 1:
+            self._window_start = now
+            self._window_count = 0
+        self._window_count += 1
+        return self._window_count > limit
+
+    async def _gate(self, key: str) -> Optional[web.Response]:
+        """Apply latency, 429s and injected errors; return an error response if any"""
+        self.calls[key] += 1
+        if self._rate_limited():
+            self.calls[f"{key} 429"] += 1
+            return self.rate_limit_response()
+        await asyncio.sleep(self.behaviour.delay())
+        if self.behaviour.should_fail():
+            self.calls[f"{key} 5xx"] += 1
+            return self.error_response()
+        return None
+
+    def rate_limit_response(self) -> web.Response:
+        return web.json_response(
+            {"error": "rate_limited"},
+            status=429,
+            headers={"Retry-After": str(self.behaviour.retry_after)}
+        )
+
+    def error_response(self) -> web.Response:
+        return web.json_response({"error": "internal"}, status=500)
+
+    def start(self) -> "FakeServer":
+        self._thread = threading.Thread(target=self._serve, name=f"{self.name}-server", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=10)
+        return self
+
+    def _serve(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        app = web.Application()
+        self.routes(app)
+        self._runner = web.AppRunner(app, access_log=None)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, self.host, self.port)
+        self._loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    def stop(self):
+        if not self._loop:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=10)
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self.calls)
+
+
+CHAT_REPLY = (
+    "Happy to help with that. The freshest deals are in the Notion database, "
+    "and you can ask me for them by geo, price range or traffic source."
+)
+
+
+class FakeAnthropicServer(FakeServer):
+    """Answers POST /v1/messages with a deal parse of the prompt text.
+
+    Streaming requests get a canned chat reply as server-sent events: the
+    configured latency is the time to the first token, after which one word
+    is sent every `token_interval_ms`.
+    """
+
+    name = "anthropic"
+
+    def __init__(self, *args, token_interval_ms: float = 20, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.token_interval_ms = token_interval_ms
+
+    def routes(self, app: web.Application):
+        app.router.add_post("/v1/messages", self.create_message)
+
+    def rate_limit_response(self) -> web.Response:
+        return web.json_response(
+            {"type": "error", "error": {"type": "rate_limit_error", "message": "Rate limited"}},
+            status=429,
+            headers={"Retry-After": str(self.behaviour.retry_after)}
+        )
+
+    def error_response(self) -> web.Response:
+        return web.json_response(
+            {"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}},
+            status=529
+        )
+
+    async def create_message(self, request: web.Request) -> web.Response:
+        error = await self._gate("POST /v1/messages")
+        if error:
+            return error
+
+        body = await request.json()
+        if body.get("stream"):
+            return await self.stream_message(request, body)
+        prompt = body["messages"][-1]["content"]
+        text = json.dumps(extract_deal(prompt))
+        return web.json_response({
+            "id": f"msg_{uuid.uuid4().hex}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": len(prompt) // 4, "output_tokens": len(text) // 4}
+        })
+
+
+    async def stream_message(self, request: web.Request, body: Dict) -> web.StreamResponse:
+        self.calls["POST /v1/messages stream"] += 1
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(request)
+
+        async def send(event: str, data: Dict):
+            await response.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+
+        words = CHAT_REPLY.split(" ")
+        await send("message_start", {"type": "message_start", "message": {
+            "id": f"msg_{uuid.uuid4().hex}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model"),
+            "content": [],
+            "stop_reason": None,
+            "stop_sequence": None,
+            "usage": {"input_tokens": 10, "output_tokens": 1}
+        }})
+        await send("content_block_start", {
+            "type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}
+        })
+        for i, word in enumerate(words):
+            if i:
+                await asyncio.sleep(self.token_interval_ms / 1000)
+            await send("content_block_delta", {
+                "type": "content_block_delta", "index": 0,
+                "delta": {"type": "text_delta", "text": word if i == 0 else f" {word}"}
+            })
+        await send("content_block_stop", {"type": "content_block_stop", "index": 0})
+        await send("message_delta", {
+            "type": "message_delta",
+            "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+            "usage": {"output_tokens": len(words)}
+        })
+        await send("message_stop", {"type": "message_stop"})
+        await response.write_eof()
+        return response
+
+
+class FakeNotionServer(FakeServer):
+    """Accepts page creates/updates, database queries and users/me like the Notion API"""
+
+    name = "notion"
+
+    def routes(self, app: web.Application):
+        app.router.add_post("/v1/pages", self.create_page)
+        app.router.add_patch("/v1/pages/{page_id}", self.update_page)
+        app.router.add_post("/v1/databases/{database_id}/query", self.query_database)
+        app.router.add_get("/v1/databases/{database_id}", self.retrieve_database)
+        app.router.add_get("/v1/users/me", self.retrieve_bot_user)
+
+    def rate_limit_response(self) -> web.Response:
+        return web.json_response(
+            {"object": "error", "status": 429, "code": "rate_limited", "message": "Rate limited"},
+            status=429,
+            headers={"Retry-After": str(self.behaviour.retry_after)}
+        )
+
+    def error_response(self) -> web.Response:
+        return web.json_response(
+            {"object": "error", "status": 502, "code": "service_unavailable", "message": "Unavailable"},
+            status=502
+        )
+
+    def _page(self, page_id: str, properties: Dict) -> Dict:
+        return {
+            "object": "page",
+            "id": page_id,
+            "url": f"https://www.notion.so/{page_id.replace('-', '')}",
+            "properties": properties
+        }
+
+    async def create_page(self, request: web.Request) -> web.Response:
+        error = await self._gate("POST /v1/pages")
+        if error:
+            return error
+        body = await request.json()
+        return web.json_response(self._page(str(uuid.uuid4()), body.get("properties", {})))
+
+    async def update_page(self, request: web.Request) -> web.Response:
+        error = await self._gate("PATCH /v1/pages")
+        if error:
+            return error
+        body = await request.json()
+        return web.json_response(self._page(request.match_info["page_id"], body.get("properties", {})))
+
+    async def query_database(self, request: web.Request) -> web.Response:
+        error = await self._gate("POST /v1/databases/query")
+        if error:
+            return error
+        return web.json_response({"object": "list", "results": [], "has_more": False, "next_cursor": None})
+
+    async def retrieve_database(self, request: web.Request) -> web.Response:
+        error = await self._gate("GET /v1/databases")
+        if error:
+            return error
+        return web.json_response({
+            "object": "database",
+            "id": request.match_info["database_id"],
+            "properties": {}
+        })
+
+    async def retrieve_bot_user(self, request: web.Request) -> web.Response:
+        """Token check the worker makes during warm-up"""
+        error = await self._gate("GET /v1/users/me")
+        if error:
+            return error
+        return web.json_response({
+            "object": "user",
+            "id": "00000000-0000-0000-0000-000000000001",
+            "type": "bot",
+            "name": "Bench integration",
+            "bot": {}
+        })
+
+
+class FakeTelegramServer(FakeServer):
+    """Accepts Bot API sendMessage/editMessageText/setWebhook calls"""
+
+    name = "telegram"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._message_id = 0
+        self.first_message_at: Dict[int, float] = {}  # chat_id -> epoch seconds of the first reply
+
+    def routes(self, app: web.Application):
+        app.router.add_post("/bot{token}/{method}", self.call_method)
+
+    def rate_limit_response(self) -> web.Response:
+        return web.json_response(
+            {
+                "ok": False,
+                "error_code": 429,
+                "description": f"Too Many Requests: retry after {self.behaviour.retry_after}",
+                "parameters": {"retry_after": self.behaviour.retry_after}
+            },
+            status=429
+        )
+
+    def error_response(self) -> web.Response:
+        return web.json_response({"ok": False, "error_code": 502, "description": "Bad Gateway"}, status=502)
+
+    async def call_method(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        error = await self._gate(method)
+        if error:
+            return error
+
+        body = await request.json()
+        if method == "sendMessage":
+            self.first_message_at.setdefault(body.get("chat_id"), time.time())
+            self._message_id += 1
+            result = {"message_id": self._message_id, "chat": {"id": body.get("chat_id")}, "text": body.get("text")}
+        elif method == "editMessageText":
+            result = {"message_id": body.get("message_id"), "chat": {"id": body.get("chat_id")}, "text": body.get("text")}
+        else:
+            result = True
+        return web.json_response({"ok": True, "result": result})
@@ -0,0 +1,337 @@
+"""Offline end-to-end load test for the deal pipeline.
+
+Starts fake Anthropic, Notion and Telegram Bot API servers, serves the API router locally,
+replays a corpus of Telegram updates through /api/webhook/telegram and runs
+`app.worker` processes against the result. Only Postgres and Redis are
+real; point DATABASE_URL and REDIS_URL at disposable local instances
+(e.g. the docker-compose services), never at production.
+
+    python -m benchmarks.run --messages 500 --workers 2 --claude-latency 800
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from benchmarks.corpus import generate_chat, generate_corpus
+from benchmarks.fakes import FakeAnthropicServer, FakeBehaviour, FakeNotionServer, FakeTelegramServer
+
+# Settings that must exist for app.core.config to load; fakes ignore credentials
+PLACEHOLDER_SETTINGS = {
+    "TELEGRAM_BOT_TOKEN": "bench-token",
+    "ANTHROPIC_API_KEY": "bench-key",
+    "NOTION_API_KEY": "bench-key",
+    "NOTION_DATABASE_ID": "bench-database",
+    "ENVIRONMENT": "benchmark",
+    "LOG_LEVEL": "WARNING",
+    "MAX_RETRIES": "3",
+    "WEBHOOK_SECRET": "bench-secret",
+}
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+GROUP_CHAT = {"id": -100123, "type": "group", "title": "Bench partners"}
+PRIVATE_CHAT_BASE = 1000000
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(math.ceil(p / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline load test for the deal pipeline")
+    parser.add_argument("--messages", type=int, default=200, help="number of messages to replay")
+    parser.add_argument("--chat-messages", type=int, default=0,
+                        help="private-chat questions mixed in (exercises streamed replies)")
+    parser.add_argument("--seed", type=int, default=42, help="corpus seed")
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent webhook requests")
+    parser.add_argument("--rate", type=float, default=0, help="target webhook requests/sec (0 = unthrottled)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds to wait for the pipeline to drain")
+    parser.add_argument("--api-port", type=int, default=8765)
+
+    parser.add_argument("--claude-latency", type=float, default=800, help="fake Claude latency (ms)")
+    parser.add_argument("--claude-jitter", type=float, default=200, help="fake Claude latency jitter (ms)")
+    parser.add_argument("--claude-error-rate", type=float, default=0.0)
+    parser.add_argument("--claude-rps", type=float, default=None, help="fake Claude rate limit before 429s")
+    parser.add_argument("--claude-token-interval", type=float, default=20, help="fake Claude ms between streamed tokens")
+    parser.add_argument("--notion-latency", type=float, default=300, help="fake Notion latency (ms)")
+    parser.add_argument("--notion-jitter", type=float, default=100, help="fake Notion latency jitter (ms)")
+    parser.add_argument("--notion-error-rate", type=float, default=0.0)
+    parser.add_argument("--notion-rps", type=float, default=3, help="fake Notion rate limit before 429s")
+    parser.add_argument("--telegram-latency", type=float, default=50, help="fake Telegram Bot API latency (ms)")
+    parser.add_argument("--telegram-rps", type=float, default=30, help="fake Telegram rate limit before 429s")
+
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--redis-url", default=os.getenv("REDIS_URL"))
+    parser.add_argument("--json", dest="json_path", help="also write the report as JSON to this path")
+    return parser.parse_args(argv)
+
+
+def configure_environment(
+    args: argparse.Namespace,
+    anthropic: FakeAnthropicServer,
+    notion: FakeNotionServer,
+    telegram: FakeTelegramServer
+) -> Dict[str, str]:
+    """Point the app at the fakes; must run before any `app` import"""
+    if not args.database_url or not args.redis_url:
+        raise SystemExit("DATABASE_URL and REDIS_URL (or --database-url/--redis-url) are required")
+    for key, value in PLACEHOLDER_SETTINGS.items():
+        os.environ.setdefault(key, value)
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["REDIS_URL"] = args.redis_url
+    os.environ["ANTHROPIC_BASE_URL"] = anthropic.base_url
+    os.environ["NOTION_BASE_URL"] = notion.base_url
+    os.environ["TELEGRAM_API_URL"] = telegram.base_url
+    return dict(os.environ)
+
+
+class ApiServer:
+    """Serves the API router with uvicorn in a background thread"""
+
+    def __init__(self, port: int):
+        import uvicorn
+        from fastapi import FastAPI
+        from app.api.routes import router
+
+        app = FastAPI()
+        app.include_router(router, prefix="/api")
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        self.server.install_signal_handlers = lambda: None
+        self.thread = threading.Thread(target=self.server.run, name="api-server", daemon=True)
+        self.url = f"http://127.0.0.1:{port}"
+
+    def start(self):
+        self.thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    def stop(self):
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+
+def interleave(corpus: List[str], chat: List[str]) -> List[Tuple[str, Dict]]:
+    """Spread private-chat messages evenly through the deal corpus"""
+    updates = [(text, GROUP_CHAT) for text in corpus]
+    step = len(updates) / (len(chat) + 1) if chat else 0
+    for i, text in reversed(list(enumerate(chat))):
+        chat_id = PRIVATE_CHAT_BASE + i
+        updates.insert(int(step * (i + 1)), (text, {"id": chat_id, "type": "private", "first_name": "Bench"}))
+    return updates
+
+
+async def replay(url: str, updates: List[Tuple[str, Dict]], concurrency: int, rate: float) -> Dict:
+    """POST Telegram updates; returns correlation ids, webhook latencies and chat send times"""
+    import aiohttp
+
+    semaphore = asyncio.Semaphore(concurrency)
+    correlation_ids = []
+    latencies = []
+    chat_sent_at = {}
+    errors = 0
+    base_id = int(time.time() * 1000)
+    started = time.monotonic()
+
+    async def send(session, index: int, text: str, chat: Dict):
+        nonlocal errors
+        if rate:
+            await asyncio.sleep(max(started + index / rate - time.monotonic(), 0))
+        update = {
+            "update_id": base_id + index,
+            "message": {
+                "message_id": base_id + index,
+                "date": int(time.time()),
+                "chat": chat,
+                "from": {"id": chat["id"] if chat["type"] == "private" else 4242, "is_bot": False, "first_name": "Bench"},
+                "text": text
+            }
+        }
+        async with semaphore:
+            request_start = time.monotonic()
+            if chat["type"] == "private":
+                chat_sent_at[chat["id"]] = time.time()
+            try:
+                async with session.post(f"{url}/api/webhook/telegram", json=update) as response:
+                    body = await response.json()
+                    if response.status == 200:
+                        correlation_ids.append(body["correlation_id"])
+                    else:
+                        errors += 1
+            except aiohttp.ClientError:
+                errors += 1
+            latencies.append((time.monotonic() - request_start) * 1000)
+
+    async with aiohttp.ClientSession() as session:
+        await asyncio.gather(*(send(session, i, text, chat) for i, (text, chat) in enumerate(updates)))
+
+    return {
+        "correlation_ids": correlation_ids,
+        "latencies_ms": latencies,
+        "chat_sent_at": chat_sent_at,
+        "errors": errors,
+        "seconds": time.monotonic() - started
+    }
+
+
+def wait_for_pipeline(correlation_ids: List[str], timeout: float) -> List:
+    """Poll until every replayed message reached a terminal status"""
+    from app.db.base import SessionLocal
+    from app.models.message import MessageProcessing
+
+    deadline = time.monotonic() + timeout
+    db = SessionLocal()
+    try:
+        while True:
+            rows = (
+                db.query(
+                    MessageProcessing.status,
+                    MessageProcessing.total_ms,
+                    MessageProcessing.attempts,
+                    MessageProcessing.created_at,
+                    MessageProcessing.processed_at
+                )
+                .filter(MessageProcessing.correlation_id.in_(correlation_ids))
+                .all()
+            )
+            done = [row for row in rows if row.status in TERMINAL_STATUSES]
+            if len(done) >= len(correlation_ids) or time.monotonic() > deadline:
+                return rows
+            db.rollback()
+            time.sleep(0.5)
+    finally:
+        db.close()
+
+
+def build_report(
+    args,
+    webhook: Dict,
+    rows: List,
+    elapsed: float,
+    fakes: Dict[str, Dict],
+    first_reply_at: Dict[int, float]
+) -> Dict:
+    completed = [row for row in rows if row.status == "completed"]
+    end_to_end = [row.total_ms for row in completed if row.total_ms is not None]
+    first_reply = [
+        (first_reply_at[chat_id] - sent_at) * 1000
+        for chat_id, sent_at in webhook["chat_sent_at"].items() if chat_id in first_reply_at
+    ]
+    return {
+        "messages": args.messages,
+        "workers": args.workers,
+        "webhook": {
+            "accepted": len(webhook["correlation_ids"]),
+            "errors": webhook["errors"],
+            "requests_per_second": round(len(webhook["latencies_ms"]) / webhook["seconds"], 1) if webhook["seconds"] else None,
+            "p50_ms": percentile(webhook["latencies_ms"], 50),
+            "p95_ms": percentile(webhook["latencies_ms"], 95),
+            "p99_ms": percentile(webhook["latencies_ms"], 99)
+        },
+        "pipeline": {
+            "completed": len(completed),
+            "failed": sum(1 for row in rows if row.status == "failed"),
+            "unfinished": len(webhook["correlation_ids"]) - sum(1 for row in rows if row.status in TERMINAL_STATUSES),
+            "throughput_per_second": round(len(completed) / elapsed, 2) if elapsed else None,
+            "elapsed_seconds": round(elapsed, 1),
+            "end_to_end_p50_ms": percentile(end_to_end, 50),
+            "end_to_end_p95_ms": percentile(end_to_end, 95),
+            "end_to_end_p99_ms": percentile(end_to_end, 99)
+        },
+        "chat": {
+            "messages": args.chat_messages,
+            "replied": len(first_reply),
+            "first_reply_p50_ms": percentile(first_reply, 50),
+            "first_reply_p95_ms": percentile(first_reply, 95)
+        },
+        "api_calls": fakes
+    }
+
+
+def print_report(report: Dict):
+    print(f"\nReplayed {report['messages']} messages with {report['workers']} worker(s)")
+    for section in ("webhook", "pipeline", "chat"):
+        print(f"\n[{section}]")
+        for key, value in report[section].items():
+            print(f"  {key:<24} {value}")
+    for name, calls in report["api_calls"].items():
+        print(f"\n[{name} calls]")
+        for key, value in sorted(calls.items()):
+            print(f"  {key:<32} {value}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    anthropic = FakeAnthropicServer(FakeBehaviour(
+        latency_ms=args.claude_latency,
+        jitter_ms=args.claude_jitter,
+        error_rate=args.claude_error_rate,
+        rate_limit_per_second=args.claude_rps,
+        seed=args.seed
+    ), token_interval_ms=args.claude_token_interval).start()
+    notion = FakeNotionServer(FakeBehaviour(
+        latency_ms=args.notion_latency,
+        jitter_ms=args.notion_jitter,
+        error_rate=args.notion_error_rate,
+        rate_limit_per_second=args.notion_rps,
+        seed=args.seed + 1
+    )).start()
+    telegram = FakeTelegramServer(FakeBehaviour(
+        latency_ms=args.telegram_latency,
+        rate_limit_per_second=args.telegram_rps,
+        seed=args.seed + 2
+    )).start()
+    env = configure_environment(args, anthropic, notion, telegram)
+
+    api = ApiServer(args.api_port)
+    api.start()
+    workers = [
+        subprocess.Popen([sys.executable, "-m", "app.worker"], env=env)
+        for _ in range(args.workers)
+    ]
+
+    try:
+        updates = interleave(generate_corpus(args.messages, args.seed), generate_chat(args.chat_messages, args.seed))
+        started = time.monotonic()
+        webhook = asyncio.run(replay(api.url, updates, args.concurrency, args.rate))
+        rows = wait_for_pipeline(webhook["correlation_ids"], args.timeout)
+        elapsed = time.monotonic() - started
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            try:
+                worker.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                worker.kill()
+        api.stop()
+        anthropic.stop()
+        notion.stop()
+        telegram.stop()
+
+    report = build_report(args, webhook, rows, elapsed, {
+        "anthropic": anthropic.stats(),
+        "notion": notion.stats(),
+        "telegram": telegram.stats()
+    }, telegram.first_message_at)
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
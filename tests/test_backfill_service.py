@@ -0,0 +1,89 @@
+import json
+from datetime import datetime
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("redis")
+pytest.importorskip("anthropic")
+
+from app.services import backfill_service as module
+from app.services.backfill_service import BackfillImporter, message_date
+
+
+class FakeInsert:
+    def __init__(self, model):
+        self.rows = []
+
+    def values(self, rows):
+        self.rows = rows
+        return self
+
+    def returning(self, *columns):
+        return self
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeDB:
+    """Assigns ids in insert order but returns them reversed, as Postgres may"""
+
+    def __init__(self):
+        self.inserted = []
+        self.committed = False
+
+    def execute(self, statement):
+        self.inserted = statement.rows
+        returned = [(100 + index, row["telegram_message_id"]) for index, row in enumerate(statement.rows)]
+        return FakeResult(list(reversed(returned)))
+
+    def commit(self):
+        self.committed = True
+
+
+def test_message_date_prefers_unixtime():
+    assert message_date({"date": "2024-01-05T14:34:56", "date_unixtime": "1704458096"}) == datetime(2024, 1, 5, 12, 34, 56)
+    assert message_date({"date": "2024-01-05T14:34:56"}) == datetime(2024, 1, 5, 14, 34, 56)
+    assert message_date({"date": "yesterday"}) is None
+    assert message_date({}) is None
+
+
+def test_insert_batch_matches_ids_by_message_and_keeps_sent_date(monkeypatch):
+    monkeypatch.setattr(module, "insert", FakeInsert)
+    importer = BackfillImporter(queue_service=object(), batch_size=10, max_backlog=10)
+    sent = datetime(2024, 1, 5, 12, 34, 56)
+    batch = [
+        {"id": 7, "text": "DE CPA 800", "date": sent},
+        {"id": 8, "text": "IT CPA 900", "date": None}
+    ]
+
+    db = FakeDB()
+    payloads = importer._insert_batch(db, batch, partner_name="AffNet")
+    assert db.committed
+    assert [(p["telegram_message_id"], p["db_id"]) for p in payloads] == [("7", 100), ("8", 101)]
+
+    dated, undated = db.inserted
+    # created_at is the import time so retention never drops unprocessed history
+    assert dated["sent_at"] == sent and dated["created_at"] > sent
+    assert undated["sent_at"] is None
+    assert dated["created_at"] == undated["created_at"]
+
+
+def test_batches_skip_chatter(tmp_path):
+    export = tmp_path / "result.json"
+    export.write_text(json.dumps({"name": "Partners", "messages": [
+        {"id": 1, "type": "message", "date": "2024-05-01T10:00:00", "text": "good morning"},
+        {"id": 2, "type": "message", "date": "2024-05-01T10:05:00", "text": ["DE CPA ", {"type": "bold", "text": "800$"}]},
+        {"id": 3, "type": "service", "date": "2024-05-01T10:06:00", "text": ""},
+        {"id": 4, "type": "message", "date": "2024-05-01T10:07:00", "text": "ok thanks"},
+        {"id": 5, "type": "message", "date": "2024-05-01T10:08:00", "text": "IT CPL 40 FB"}
+    ]}))
+
+    importer = BackfillImporter(queue_service=object(), batch_size=10, max_backlog=10)
+    batches = list(importer._batches(str(export), after_id=0))
+    assert [[item["id"] for item in batch] for batch in batches] == [[2, 5]]
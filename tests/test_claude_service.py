@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip("anthropic")
+pytest.importorskip("sqlalchemy")
+
+from app.services.claude_service import is_deal_post, is_deal_query
+from benchmarks.corpus import generate_chat, generate_corpus
+
+
+@pytest.mark.parametrize("text", [
+    "show me CPA deals in DE",
+    "any cpl deals for UK?",
+    "which deals pay over $800?",
+    "active deals AT",
+])
+def test_deal_queries_are_not_deal_posts(text):
+    assert is_deal_query(text)
+    assert not is_deal_post(text)
+
+
+@pytest.mark.parametrize("text", ["good morning", "thanks! what else is trending?", "check column names"])
+def test_conversation_is_neither(text):
+    assert not is_deal_query(text)
+    assert not is_deal_post(text)
+
+
+def test_corpus_posts_are_deal_posts():
+    assert all(is_deal_post(text) for text in generate_corpus(200, 7))
+    assert not any(is_deal_post(text) for text in generate_chat(50, 7))
@@ -0,0 +1,76 @@
+import asyncio
+import pytest
+
+pytest.importorskip("redis")
+pytest.importorskip("pydantic")
+
+from app.services import context_store as module
+from app.services.context_store import ContextStore, InMemoryContextStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(module.time, "time", lambda: now[0])
+    return now
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_base_store_is_abstract():
+    with pytest.raises(TypeError):
+        ContextStore(max_messages=10, ttl_seconds=10)
+
+
+def test_expired_user_behind_live_user_is_not_returned(clock):
+    store = InMemoryContextStore(max_users=10, max_messages=10, ttl_seconds=10)
+    run(store.append("a", "user", "hello"))
+    run(store.append("b", "user", "hi"))
+
+    # Reading "a" moves it behind "b"; then only "b" stays active
+    clock[0] += 5
+    assert run(store.get_messages("a"))
+    clock[0] += 4
+    run(store.append("b", "user", "still here"))
+
+    clock[0] += 7  # "a" last seen 11s ago, "b" 7s ago
+    assert run(store.get_messages("a")) == []
+    assert len(run(store.get_messages("b"))) == 2
+
+
+def test_read_refreshes_ttl(clock):
+    store = InMemoryContextStore(max_users=10, max_messages=10, ttl_seconds=10)
+    run(store.append("a", "user", "hello"))
+    for _ in range(3):
+        clock[0] += 8
+        assert run(store.get_messages("a"))
+
+
+def test_append_after_expiry_starts_fresh_history(clock):
+    store = InMemoryContextStore(max_users=10, max_messages=10, ttl_seconds=10)
+    run(store.append("a", "user", "old"))
+    clock[0] += 11
+    run(store.append("a", "user", "new"))
+    assert [m["content"] for m in run(store.get_messages("a"))] == ["new"]
+
+
+def test_least_recently_used_user_is_evicted(clock):
+    store = InMemoryContextStore(max_users=2, max_messages=10, ttl_seconds=100)
+    run(store.append("a", "user", "1"))
+    run(store.append("b", "user", "2"))
+    run(store.get_messages("a"))  # "b" is now least recently used
+    run(store.append("c", "user", "3"))
+
+    assert len(store) == 2
+    assert run(store.get_messages("b")) == []
+    assert run(store.get_messages("a"))
+    assert run(store.get_messages("c"))
+
+
+def test_messages_per_user_are_capped(clock):
+    store = InMemoryContextStore(max_users=10, max_messages=3, ttl_seconds=100)
+    for i in range(5):
+        run(store.append("a", "user", str(i)))
+    assert [m["content"] for m in run(store.get_messages("a"))] == ["2", "3", "4"]
@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from app.services import deal_query_service as module
+from app.services.deal_query_service import DealQueryService
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def incr(self, key):
+        self.values[key] = int(self.values.get(key, 0)) + 1
+        return self.values[key]
+
+
+class FakeQuery:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return list(self.rows)
+
+
+@pytest.fixture
+def service():
+    return DealQueryService(redis_client=FakeRedis(), cache_ttl=60)
+
+
+def test_price_range_requires_price_context(service):
+    filters = service.parse_filters("show deals DE cpa 500-800")
+    assert (filters["min_price"], filters["max_price"]) == (500, 800)
+
+    filters = service.parse_filters("show deals DE from 2024-05")
+    assert "min_price" not in filters and "max_price" not in filters
+
+    filters = service.parse_filters("deals over 10 days old")
+    assert "min_price" not in filters
+
+
+def test_word_like_country_codes_are_geos(service):
+    assert service.parse_filters("active deals AT")["geos"] == ["AT"]
+    assert service.parse_filters("cpa deals IN and MY")["geos"] == ["IN", "MY"]
+    assert service.parse_filters("deals FB DE")["geos"] == ["DE"]
+    # All-caps text: word-like codes are read as words
+    assert service.parse_filters("SHOW ME DEALS IN DE")["geos"] == ["DE"]
+
+
+def test_min_price_needs_price_context(service):
+    assert service.parse_filters("deals DE over $500")["min_price"] == 500
+    assert service.parse_filters("deals DE from 450$")["min_price"] == 450
+    assert service.parse_filters("deals DE with cpa from 600")["min_price"] == 600
+    assert service.parse_filters("deals DE at least 300")["min_price"] == 300
+
+
+def test_build_query_compiles_for_postgres(service):
+    filters = service.parse_filters("show CPA deals DE google under 900$ funnel Bitcoin Era")
+    assert filters["sources"] and filters["funnels"]
+
+    sql = str(service.build_query(Session(), filters).statement.compile(dialect=postgresql.dialect()))
+    assert "parsed_deals.sources && " in sql
+    assert "parsed_deals.funnels && " in sql
+    assert "parsed_deals.geo IN" in sql
+
+
+def test_cache_entries_expire_after_ttl(service, monkeypatch):
+    calls = []
+    monkeypatch.setattr(service, "build_query", lambda db, filters: calls.append(1) or FakeQuery([]))
+
+    now = [1000.0]
+    monkeypatch.setattr(module.time, "monotonic", lambda: now[0])
+
+    asyncio.run(service.query_deals(None, "show deals DE"))
+    asyncio.run(service.query_deals(None, "show deals DE"))
+    assert len(calls) == 1
+
+    now[0] += 61
+    asyncio.run(service.query_deals(None, "show deals DE"))
+    assert len(calls) == 2
+
+
+def test_generation_bump_invalidates_cache(service, monkeypatch):
+    calls = []
+    monkeypatch.setattr(service, "build_query", lambda db, filters: calls.append(1) or FakeQuery([]))
+
+    asyncio.run(service.query_deals(None, "show deals DE"))
+    service.invalidate_cache()
+    asyncio.run(service.query_deals(None, "show deals DE"))
+    assert len(calls) == 2
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from app.services.dedup_service import DedupService, SimHashIndex, simhash
+
+DEAL_TEXT = "DE German CPA 800$ + 10% CRG sources FB Google funnel Immediate Edge CR 7-9%"
+
+
+def make_deal(**fields):
+    values = {
+        "id": 1,
+        "cpa_amount": 800,
+        "cpl_amount": None,
+        "crg_percentage": 10,
+        "conversion_rate": "7-9%",
+        "deduction_limit": None,
+        "conversion_current": None,
+        "notion_url": "https://notion.so/page",
+        "active_status": "Active",
+        "expiration_date": None
+    }
+    values.update(fields)
+    return SimpleNamespace(**values)
+
+
+class FakeDB:
+    def __init__(self, deals):
+        self.deals = {deal.id: deal for deal in deals}
+
+    def query(self, model):
+        return self
+
+    def filter_by(self, id):
+        self._id = id
+        return self
+
+    def first(self):
+        return self.deals.get(self._id)
+
+
+def flip(value, *bits):
+    for bit in bits:
+        value ^= 1 << bit
+    return value
+
+
+def test_band_lookup_finds_hashes_within_three_bits():
+    index = SimHashIndex()
+    base = 0x0123456789ABCDEF
+    # One flipped bit in three of the four bands still leaves one band intact
+    index.add(1, flip(base, 0, 20, 40))
+    assert index.nearest(base, max_distance=3) == (1, 3)
+
+
+def test_band_lookup_ignores_distant_hashes():
+    index = SimHashIndex()
+    base = 0x0123456789ABCDEF
+    index.add(1, flip(base, 0, 20, 40, 60))
+    index.add(2, flip(base, 1, 2))
+    assert index.nearest(base, max_distance=1) is None
+    assert index.nearest(base, max_distance=3) == (2, 2)
+
+
+def test_band_lookup_prefers_newest_on_ties_and_forgets_removed():
+    index = SimHashIndex()
+    base = 0x0123456789ABCDEF
+    index.add(1, flip(base, 5))
+    index.add(2, flip(base, 50))
+    assert index.nearest(base, max_distance=3) == (2, 1)
+
+    index.remove(2)
+    assert index.nearest(base, max_distance=3) == (1, 1)
+    index.remove(1)
+    assert len(index) == 0 and not index.buckets
+
+
+def test_price_change_keeps_hash():
+    assert simhash(DEAL_TEXT) == simhash(DEAL_TEXT.replace("800$", "850$"))
+
+
+def test_diff_identical_repost():
+    assert DedupService(max_distance=3).diff(DEAL_TEXT, DEAL_TEXT, make_deal()) == {}
+
+
+def test_diff_maps_changed_numbers_to_fields():
+    service = DedupService(max_distance=3)
+    new_text = DEAL_TEXT.replace("800$", "850$").replace("10% CRG", "12% CRG")
+    assert service.diff(DEAL_TEXT, new_text, make_deal()) == {"cpa_amount": 850.0, "crg_percentage": 12.0}
+
+    new_text = DEAL_TEXT.replace("CR 7-9%", "CR 8-9%")
+    assert service.diff(DEAL_TEXT, new_text, make_deal()) == {"conversion_rate": "8-9%"}
+
+
+def test_diff_needs_full_parse_for_word_or_ambiguous_changes():
+    service = DedupService(max_distance=3)
+    assert service.diff(DEAL_TEXT, DEAL_TEXT.replace("Google", "Native"), make_deal()) is None
+    # 10 is both the CRG and the conversion rate
+    text = "DE CPA 800 CRG 10 CR 10%"
+    assert service.diff(text, text.replace("CRG 10", "CRG 12"), make_deal(conversion_rate="10%")) is None
+
+
+def test_find_duplicate_skips_expired_deals(monkeypatch):
+    service = DedupService(max_distance=3)
+    monkeypatch.setattr(service, "refresh", lambda db: 0)
+    value = simhash(DEAL_TEXT)
+    service.index.add(1, value)
+    service.index.add(2, value)
+    service.index.add(3, value)
+    db = FakeDB([
+        make_deal(id=1),
+        make_deal(id=2, expiration_date=datetime.utcnow() - timedelta(days=1)),
+        make_deal(id=3, active_status="Expired")
+    ])
+
+    deal, distance = service.find_duplicate(db, DEAL_TEXT)
+    assert (deal.id, distance) == (1, 0)
+    assert set(service.index.hashes) == {1}
+
+    db.deals[1].active_status = "Expired"
+    assert service.find_duplicate(db, DEAL_TEXT) is None
@@ -0,0 +1,60 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("notion_client")
+
+from app.services.expiration_service import ExpirationSweeper
+
+
+class FakeNotion:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+
+    async def update_active_status(self, page_id, status):
+        return page_id not in self.failing
+
+
+class FakeDealQuery:
+    def __init__(self):
+        self.invalidations = 0
+
+    def invalidate_cache(self):
+        self.invalidations += 1
+        return True
+
+
+class FakeDB:
+    def __init__(self):
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+
+
+def make_sweeper(batches, failing=()):
+    deal_query = FakeDealQuery()
+    sweeper = ExpirationSweeper(notion_service=FakeNotion(failing), deal_query_service=deal_query, batch_size=2)
+    pending = iter(batches)
+    sweeper._claim_batch = lambda db, now, skip: next(pending, [])
+    return sweeper, deal_query
+
+
+def deal(deal_id):
+    return SimpleNamespace(id=deal_id, notion_page_id=f"page-{deal_id}", notion_url=None, active_status="Active")
+
+
+def test_invalidates_cache_after_each_batch_that_expired_deals():
+    sweeper, deal_query = make_sweeper([[deal(1), deal(2)], [deal(3)]])
+    db = FakeDB()
+    result = asyncio.run(sweeper.sweep(db))
+    assert result == {"expired": 3, "failed": 0}
+    assert (db.commits, deal_query.invalidations) == (2, 2)
+
+
+def test_batch_without_changes_keeps_cache():
+    sweeper, deal_query = make_sweeper([[deal(1)]], failing={"page-1"})
+    result = asyncio.run(sweeper.sweep(FakeDB()))
+    assert result == {"expired": 0, "failed": 1}
+    assert deal_query.invalidations == 0
@@ -0,0 +1,46 @@
+import os
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("psycopg2")
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from app.models.message import MessageProcessing
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+@pytest.fixture
+def db():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set")
+    engine = create_engine(TEST_DATABASE_URL)
+    conn = engine.connect()
+    trans = conn.begin()
+    # Everything below lives in a throwaway schema dropped by the rollback
+    conn.execute(text("CREATE SCHEMA test_models"))
+    conn.execute(text("SET LOCAL search_path TO test_models"))
+    MessageProcessing.__table__.create(conn)
+    conn.execute(text("CREATE TABLE message_processing_default PARTITION OF message_processing DEFAULT"))
+    session = Session(bind=conn)
+    try:
+        yield session
+    finally:
+        session.close()
+        trans.rollback()
+        conn.close()
+        engine.dispose()
+
+
+def test_insert_returns_id_and_reloads(db):
+    message = MessageProcessing(telegram_message_id="1", raw_text="deal", status="pending")
+    db.add(message)
+    db.flush()
+    assert message.id is not None
+    assert message.created_at is not None
+
+    # A commit expires the instance; reloading needs the full (id, created_at) key
+    db.expire(message)
+    assert message.id is not None
+    assert message.raw_text == "deal"
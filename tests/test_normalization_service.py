@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("redis")
+
+from app.services.normalization_service import NormalizationService, fold
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def incr(self, key):
+        self.values[key] = int(self.values.get(key, 0)) + 1
+        return self.values[key]
+
+
+class FakeQuery:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return list(self.rows)
+
+
+class FakeDB:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def query(self, model):
+        return FakeQuery(self.rows)
+
+
+@pytest.fixture
+def service():
+    return NormalizationService(redis_client=FakeRedis())
+
+
+def test_fold_ignores_case_and_punctuation():
+    assert fold(" Native-Ads ") == fold("nativeads") == "nativeads"
+    assert fold("Côte d'Ivoire") == "ctedivoire"
+
+
+def test_geo_aliases(service):
+    assert service.normalize_geo("de") == "DE"
+    assert service.normalize_geo("DEU") == "DE"
+    assert service.normalize_geo("germany") == "DE"
+    assert service.normalize_geo("UK") == "GB"
+    assert service.normalize_geo("United Kingdom") == "GB"
+
+
+def test_fuzzy_match_respects_cutoff_and_length(service):
+    assert service.normalize_geo("Germnay") == "DE"
+    assert service.normalize_geo("Grmn") is None
+    # Short codes never fuzzy-match, so a typo cannot turn into another country
+    assert service.normalize_geo("DX") is None
+
+
+def test_unresolved_geo_is_not_passed_through(service):
+    for value in ("LATAM", "DEUTSCHLAND", "TIER1"):
+        assert service.normalize_geo(value) is None
+
+    deal = service.normalize_deal({"geo": "LATAM", "language_code": "es"})
+    assert deal["geo"] is None
+    assert deal["language_code"] == "ES"
+    assert deal["validation_errors"] == ["Unrecognized geo: LATAM"]
+
+
+def test_language_locale_tags(service):
+    assert service.normalize_language("en-US") == "EN"
+    assert service.normalize_language("pt_BR") == "PT"
+    assert service.normalize_language("Deutsch") == "DE"
+    assert service.normalize_language("UA") == "UK"
+    assert service.normalize_language("Multilingual") is None
+
+
+def test_sources_and_funnels_are_deduplicated(service):
+    deal = service.normalize_deal({
+        "sources": ["facebook", "FB", "google", "", "TikTok"],
+        "funnels": ["  Bitcoin   Era ", "Bitcoin Era"]
+    })
+    assert deal["sources"] == ["FB", "GG", "TIKTOK"]
+    assert deal["funnels"] == ["Bitcoin Era"]
+    assert "validation_errors" not in deal
+
+
+def test_database_aliases_merge_over_builtins(service):
+    rows = [
+        SimpleNamespace(kind="geo", alias="Deutschland", canonical="DE"),
+        SimpleNamespace(kind="source", alias="meta", canonical="FB"),
+        SimpleNamespace(kind="funnel", alias="btc era", canonical="Bitcoin Era"),
+        SimpleNamespace(kind="unknown", alias="x", canonical="y"),
+    ]
+    assert service.reload(FakeDB(rows)) == 4
+
+    assert service.normalize_geo("DEUTSCHLAND") == "DE"
+    assert service.normalize_source("Meta") == "FB"
+    assert service.normalize_funnel("BTC-Era") == "Bitcoin Era"
+    # Canonical funnel names are aliases of themselves, so typos fuzzy-match them
+    assert service.normalize_funnel("Bitcoin Eraa") == "Bitcoin Era"
+    # Built-ins survive the merge
+    assert service.normalize_geo("germany") == "DE"
+
+
+def test_maybe_reload_follows_generation(service):
+    db = FakeDB([SimpleNamespace(kind="geo", alias="Deutschland", canonical="DE")])
+    assert service.maybe_reload(db)
+    assert not service.maybe_reload(db)
+
+    service.publish_reload()
+    service._checked_at = 0.0
+    assert service.maybe_reload(db)
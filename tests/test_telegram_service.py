@@ -0,0 +1,26 @@
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from app.core.config import settings
+from app.services.telegram_service import addressed_to_bot
+
+GROUP = {"id": -100123, "type": "group"}
+
+
+def test_private_chats_are_addressed():
+    assert addressed_to_bot({"chat": {"id": 42, "type": "private"}, "text": "good morning"})
+
+
+def test_group_chatter_is_not_addressed():
+    assert not addressed_to_bot({"chat": GROUP, "text": "good morning"})
+
+
+def test_group_replies_and_mentions_are_addressed(monkeypatch):
+    monkeypatch.setattr(settings, "TELEGRAM_BOT_TOKEN", "12345:secret")
+    reply = {"chat": GROUP, "text": "and for IT?", "reply_to_message": {"from": {"id": 12345, "is_bot": True}}}
+    assert addressed_to_bot(reply)
+
+    monkeypatch.setattr(settings, "TELEGRAM_BOT_USERNAME", "DealBot")
+    assert addressed_to_bot({"chat": GROUP, "text": "@dealbot show deals DE"})
+    assert not addressed_to_bot({"chat": GROUP, "text": "@someone show deals DE"})